@@ -1,5 +1,33 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save
 
 
 class ApiConfig(AppConfig):
     name = 'api'
+
+    def ready(self):
+        from django.contrib.auth import get_user_model
+
+        from api_yamdb.db import tune_sqlite
+        from reviews.models import Category, Genre, GenreTitle, Review, Title
+        from reviews.signals import catalog_changed
+
+        from .authentication import forget_cached_user
+        from .cache import invalidate_catalog
+
+        for model in (Category, Genre, Title, GenreTitle, Review):
+            post_save.connect(invalidate_catalog, sender=model,
+                              dispatch_uid=f'catalog-save-{model.__name__}')
+            post_delete.connect(
+                invalidate_catalog, sender=model,
+                dispatch_uid=f'catalog-delete-{model.__name__}')
+        m2m_changed.connect(invalidate_catalog, sender=Title.genre.through,
+                            dispatch_uid='catalog-title-genre')
+        catalog_changed.connect(invalidate_catalog,
+                                dispatch_uid='catalog-rebuilt')
+        post_save.connect(forget_cached_user, sender=get_user_model(),
+                          dispatch_uid='auth-user-save')
+        post_delete.connect(forget_cached_user, sender=get_user_model(),
+                            dispatch_uid='auth-user-delete')
+        connection_created.connect(tune_sqlite, dispatch_uid='tune-sqlite')
@@ -0,0 +1,93 @@
+from rest_framework import permissions
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from users.revocation import revocations
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+
+ROLE_CLAIMS = ('role', 'is_staff', 'is_superuser')
+
+
+def user_cache_key(user_id):
+    return f'auth-user:{user_id}'
+
+
+def forget_cached_user(sender, instance, **kwargs):
+    """Signal receiver: drop the cached copy of a changed user."""
+    cache.delete(user_cache_key(instance.pk))
+
+
+class RoleAccessToken(AccessToken):
+    """Access token carrying the role flags of the user."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in ROLE_CLAIMS:
+            token[claim] = getattr(user, claim)
+        token['token_version'] = user.token_version
+        return token
+
+
+class RoleTokenUser(TokenUser):
+    """
+    User built from the token claims only.
+    Mirrors the role checks of CustomUser, so the permission classes
+    work without the user row.
+    """
+
+    @cached_property
+    def role(self):
+        return self.token['role']
+
+    def is_admin(self):
+        return self.role == 'admin' or self.is_superuser
+
+    def is_moderator(self):
+        return self.role == 'moderator' or self.is_staff
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that skips the user table on read requests.
+    Safe methods get a RoleTokenUser built from the token claims. Writes
+    and tokens issued without the role claims get the user row, cached
+    for AUTH_USER_CACHE_TIMEOUT seconds and dropped whenever it changes.
+    Tokens older than the last revocation of their user are rejected.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        if revocations.is_revoked(
+                validated_token.get(api_settings.USER_ID_CLAIM),
+                validated_token.get('token_version', 0)):
+            raise InvalidToken('Token is revoked')
+        if (request.method in permissions.SAFE_METHODS
+                and all(claim in validated_token for claim in ROLE_CLAIMS)
+                and api_settings.USER_ID_CLAIM in validated_token):
+            return RoleTokenUser(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+        elif not user.is_active:
+            raise AuthenticationFailed('User is inactive',
+                                       code='user_inactive')
+        return user
@@ -0,0 +1,151 @@
+from collections import defaultdict
+
+from rest_framework import status
+
+from django.db import connections, router
+
+from reviews.models import Comments, Review, Title
+from reviews.rankings import update_title_rankings
+from reviews.rating import update_title_rating
+
+from .serializers import CommentsSerializer, ReviewSerializer
+
+DUPLICATE_REVIEW = 'Вы уже писали отзыв на это произведение.'
+
+
+def _to_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _error(code, errors):
+    return {'status': code, 'errors': errors}
+
+
+def prepare_reviews(items, request):
+    """
+    Validate review items with ReviewSerializer rules.
+    Titles and existing reviews of the author are loaded with one query
+    each. Returns per-item results and the unsaved reviews paired with
+    their result dicts.
+    """
+    user = request.user
+    title_ids = {_to_id(item.get('title')) for item in items
+                 if isinstance(item, dict)}
+    titles = set(
+        Title.objects.filter(id__in=title_ids).values_list('id', flat=True))
+    reviewed = set(
+        Review.objects.filter(author=user, title_id__in=titles)
+        .values_list('title_id', flat=True)
+    )
+    results, new_reviews = [], []
+    for item in items:
+        if not isinstance(item, dict):
+            results.append(_error(status.HTTP_400_BAD_REQUEST,
+                                  'Ожидается объект.'))
+            continue
+        title_id = _to_id(item.get('title'))
+        if title_id not in titles:
+            results.append(_error(status.HTTP_404_NOT_FOUND,
+                                  {'title': ['Произведение не найдено.']}))
+            continue
+        if title_id in reviewed:
+            results.append(_error(status.HTTP_400_BAD_REQUEST,
+                                  {'non_field_errors': [DUPLICATE_REVIEW]}))
+            continue
+        serializer = ReviewSerializer(data=item, context={'request': request})
+        if not serializer.is_valid():
+            results.append(_error(status.HTTP_400_BAD_REQUEST,
+                                  serializer.errors))
+            continue
+        reviewed.add(title_id)
+        result = {'status': status.HTTP_201_CREATED}
+        results.append(result)
+        fields = {**serializer.validated_data, 'author': user}
+        new_reviews.append((Review(title_id=title_id, **fields), result))
+    return results, new_reviews
+
+
+def prepare_comments(items, request):
+    """Validate comment items with CommentsSerializer rules."""
+    review_ids = {_to_id(item.get('review')) for item in items
+                  if isinstance(item, dict)}
+    review_titles = dict(
+        Review.objects.filter(id__in=review_ids)
+        .values_list('id', 'title_id')
+    )
+    results, new_comments = [], []
+    for item in items:
+        if not isinstance(item, dict):
+            results.append(_error(status.HTTP_400_BAD_REQUEST,
+                                  'Ожидается объект.'))
+            continue
+        review_id = _to_id(item.get('review'))
+        if (review_id not in review_titles
+                or review_titles[review_id] != _to_id(item.get('title'))):
+            results.append(_error(status.HTTP_404_NOT_FOUND,
+                                  {'review': ['Отзыв не найден.']}))
+            continue
+        serializer = CommentsSerializer(data=item)
+        if not serializer.is_valid():
+            results.append(_error(status.HTTP_400_BAD_REQUEST,
+                                  serializer.errors))
+            continue
+        result = {'status': status.HTTP_201_CREATED}
+        results.append(result)
+        new_comments.append((
+            Comments(review_id=review_id, author=request.user,
+                     **serializer.validated_data),
+            result,
+        ))
+    return results, new_comments
+
+
+def bulk_insert(model, pairs, author):
+    """
+    Insert the objects with bulk_create and put their ids into the
+    results. PostgreSQL returns the ids from the insert. SQLite holds
+    its write lock from the first INSERT to the end of the transaction,
+    so the rows of the batch get consecutive ids ending with
+    last_insert_rowid(). Other backends read reviews back by their
+    unique (author, title) pair and insert comments one by one.
+    """
+    objs = [obj for obj, _ in pairs]
+    if not objs:
+        return
+    connection = connections[router.db_for_write(model)]
+    if connection.features.can_return_ids_from_bulk_insert:
+        model.objects.bulk_create(objs)
+    elif connection.vendor == 'sqlite' and connection.in_atomic_block:
+        model.objects.bulk_create(objs)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT last_insert_rowid()')
+            last_id = cursor.fetchone()[0]
+        for pk, obj in enumerate(objs, last_id - len(objs) + 1):
+            obj.pk = pk
+    elif model is Review:
+        model.objects.bulk_create(objs)
+        ids = dict(
+            Review.objects.filter(
+                author=author, title_id__in=[obj.title_id for obj in objs],
+            ).values_list('title_id', 'id')
+        )
+        for obj in objs:
+            obj.pk = ids[obj.title_id]
+    else:
+        for obj in objs:
+            obj.save(force_insert=True)
+    for obj, result in pairs:
+        result['id'] = obj.pk
+
+
+def update_ratings(new_reviews):
+    """Apply the scores of new reviews to each title once."""
+    scores = defaultdict(list)
+    for review, _ in new_reviews:
+        scores[review.title_id].append(review.score)
+    for title_id, title_scores in scores.items():
+        update_title_rating(title_id, added=title_scores)
+        update_title_rankings(title_id, new_reviews=len(title_scores))
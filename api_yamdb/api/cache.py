@@ -0,0 +1,76 @@
+import hashlib
+import time
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.http import parse_etags, urlencode
+
+CATALOG_VERSION_KEY = 'catalog-version'
+
+
+def get_catalog_version():
+    """
+    Return the current catalog version.
+    A lost version key is recreated with a new value, so entries cached
+    under the old one can never be served again.
+    """
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), None)
+        return cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    """Invalidate every cached catalog response."""
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.set(CATALOG_VERSION_KEY, time.time_ns(), None)
+
+
+def invalidate_catalog(**kwargs):
+    """Signal receiver: bump the version once the write is committed."""
+    transaction.on_commit(bump_catalog_version)
+
+
+def catalog_cache_key(request):
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    return (
+        f'catalog:{get_catalog_version()}:'
+        f'{request.get_host()}{request.path}?{query}'
+    )
+
+
+class CatalogCacheMixin:
+    """
+    Serve list GET responses from the cache; viewsets with a detail route
+    wrap `retrieve` in `cached_response` the same way.
+    The responses do not depend on the user, so they are shared by
+    everybody. The ETag is derived from the versioned key, and a matching
+    If-None-Match is answered with 304 without touching the data.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        key = catalog_cache_key(request)
+        etag = f'"{hashlib.md5(key.encode()).hexdigest()}"'
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            return Response(status=status.HTTP_304_NOT_MODIFIED,
+                            headers={'ETag': etag})
+        data = cache.get(key)
+        if data is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            cache.set(key, response.data, settings.CATALOG_CACHE_TIMEOUT)
+        else:
+            response = Response(data)
+        response['ETag'] = etag
+        return response
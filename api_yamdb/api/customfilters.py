@@ -1,5 +1,8 @@
 from django_filters import rest_framework as filters
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
 from reviews.models import Title
+from reviews.search import full_text_search
 
 
 class TitlesFilter(filters.FilterSet):
@@ -11,8 +14,17 @@ class TitlesFilter(filters.FilterSet):
     category = filters.CharFilter(
         field_name='category__slug', lookup_expr='contains')
     genre = filters.CharFilter(
-        field_name='genre__slug', lookup_expr='contains')
+        field_name='genre__slug', lookup_expr='contains', distinct=True)
 
     class Meta():
         model = Title
         fields = ['name', 'year', 'genre', 'category']
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """Full-text search with ranked results by the `search` parameter."""
+    search_param = api_settings.SEARCH_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '')
+        return full_text_search(queryset, text)
@@ -0,0 +1,117 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+
+from api_yamdb.asgi_handler import ThreadPoolASGIHandler, build_environ
+
+
+def request_scope(path):
+    path, _, query = path.partition('?')
+    return {
+        'type': 'http',
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'query_string': query.encode(),
+        'headers': [(b'host', b'testserver')],
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 50000),
+    }
+
+
+def run_wsgi(path, requests, workers, delay):
+    """
+    Sync server model: a worker thread reads the request, calls the
+    application and writes the response, slow client included.
+    """
+    application = WSGIHandler()
+
+    def serve(_):
+        started = time.perf_counter()
+        time.sleep(delay)
+        statuses = []
+        result = application(build_environ(request_scope(path), b''),
+                             lambda status, headers: statuses.append(status))
+        try:
+            for _ in result:
+                time.sleep(delay)
+        finally:
+            result.close()
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(workers) as executor:
+        return list(executor.map(serve, range(requests)))
+
+
+def run_asgi(path, requests, workers, delay, concurrency):
+    """Event loop model: slow clients wait on the loop, not on threads."""
+    application = ThreadPoolASGIHandler(
+        WSGIHandler(), read_threads=workers, threads=workers,
+        max_connections=concurrency,
+    )
+
+    async def client():
+        started = time.perf_counter()
+
+        async def receive():
+            await asyncio.sleep(delay)
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            if message['type'] == 'http.response.body':
+                await asyncio.sleep(delay)
+
+        await application(request_scope(path), receive, send)
+        return time.perf_counter() - started
+
+    async def main():
+        slots = asyncio.Semaphore(concurrency)
+
+        async def limited():
+            async with slots:
+                return await client()
+
+        return await asyncio.gather(*(limited() for _ in range(requests)))
+
+    return asyncio.run(main())
+
+
+class Command(BaseCommand):
+    """Compare the WSGI and ASGI request throughput with slow clients."""
+    help = ('Serve the same read request with simulated slow clients '
+            'through the WSGI and the ASGI application.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/v1/titles/')
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--workers', type=int, default=8,
+                            help='WSGI workers and ASGI pool threads.')
+        parser.add_argument('--concurrency', type=int, default=200,
+                            help='Simultaneous ASGI clients.')
+        parser.add_argument('--client-delay', type=float, default=0.05,
+                            help='Seconds a client takes to send the '
+                                 'request and to read the response.')
+
+    def handle(self, *args, **options):
+        runs = (
+            ('wsgi', lambda: run_wsgi(
+                options['path'], options['requests'], options['workers'],
+                options['client_delay'])),
+            ('asgi', lambda: run_asgi(
+                options['path'], options['requests'], options['workers'],
+                options['client_delay'], options['concurrency'])),
+        )
+        for name, run in runs:
+            started = time.perf_counter()
+            latencies = run()
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{name}: {len(latencies) / elapsed:.1f} req/s, "
+                f"p50 {statistics.median(latencies) * 1000:.1f} ms, "
+                f"{options['requests']} requests in {elapsed:.2f} s"
+            )
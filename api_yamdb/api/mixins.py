@@ -0,0 +1,38 @@
+from django.shortcuts import get_object_or_404
+
+from reviews.models import Review, Title
+
+
+class NestedResourceMixin:
+    """
+    Resolve the parents of a nested route (title -> review) once per
+    request. Views are created per request, so the objects are memoized
+    on the view; permissions get them through `view` and serializers
+    through the `title` and `review` context keys.
+    """
+
+    def get_title(self):
+        if not hasattr(self, '_title'):
+            if 'review_id' in self.kwargs:
+                self._title = self.get_review().title
+            else:
+                self._title = get_object_or_404(
+                    Title, id=self.kwargs['title_id'])
+        return self._title
+
+    def get_review(self):
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review.objects.select_related('title'),
+                id=self.kwargs['review_id'],
+                title_id=self.kwargs['title_id'],
+            )
+        return self._review
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if 'review_id' in self.kwargs:
+            context['review'] = self.get_review()
+        if 'title_id' in self.kwargs:
+            context['title'] = self.get_title()
+        return context
@@ -0,0 +1,53 @@
+from rest_framework.pagination import (BasePagination, CursorPagination,
+                                       PageNumberPagination)
+from rest_framework.settings import api_settings
+
+from django.conf import settings
+
+
+class FeedCursorPagination(CursorPagination):
+    """
+    Keyset pagination by primary key.
+    Every page is an index range scan and no COUNT(*) is issued.
+    """
+    ordering = 'id'
+
+
+class FeedPagination(BasePagination):
+    """
+    Page number pagination, or cursor pagination when it is requested
+    with `?pagination=cursor`, a `cursor` parameter, or enabled for all
+    requests with FEED_PAGINATION = 'cursor'.
+    Search results are always paged by number: a cursor keys on `id`
+    and would drop their ordering by relevance.
+    """
+    mode_query_param = 'pagination'
+    search_query_param = api_settings.SEARCH_PARAM
+
+    def __init__(self):
+        self.page_paginator = PageNumberPagination()
+        self.cursor_paginator = FeedCursorPagination()
+        self.paginator = self.page_paginator
+
+    def use_cursor(self, request):
+        if request.query_params.get(self.search_query_param):
+            return False
+        if self.cursor_paginator.cursor_query_param in request.query_params:
+            return True
+        mode = request.query_params.get(
+            self.mode_query_param, settings.FEED_PAGINATION)
+        return mode == 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_cursor(request):
+            self.paginator = self.cursor_paginator
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_results(self, data):
+        return data['results']
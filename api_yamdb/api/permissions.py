@@ -1,21 +1,48 @@
+from typing import NamedTuple
+
 from rest_framework import permissions, status
 
 
+class Capabilities(NamedTuple):
+    """Role flags of a user, computed once per request."""
+    authenticated: bool
+    is_moderator: bool
+    is_admin: bool
+
+
+def get_capabilities(user):
+    """
+    Return the capabilities of the user, caching them on the user object.
+    DRF keeps one user object per request, so every permission check of
+    the request reuses the same flags.
+    """
+    capabilities = getattr(user, '_capabilities', None)
+    if capabilities is not None:
+        return capabilities
+    authenticated = user.is_authenticated
+    user._capabilities = Capabilities(
+        authenticated=authenticated,
+        is_moderator=authenticated and user.is_moderator(),
+        is_admin=authenticated and user.is_admin(),
+    )
+    return user._capabilities
+
+
 class AnonymModeratorAdminAuthor(permissions.BasePermission):
     message = status.HTTP_403_FORBIDDEN
     edit_methods = ("PUT", "PATCH", "DELETE",)
 
     def has_object_permission(self, request, view, obj):
-        user = request.user
+        capabilities = get_capabilities(request.user)
         if request.method == "POST":
-            return user == user.is_authenticated
+            return capabilities.authenticated
         if request.method in permissions.SAFE_METHODS:
             return True
         if request.method in self.edit_methods:
             return (
-                user.is_moderator()
-                or user.is_admin()
-                or user == obj.author
+                capabilities.is_moderator
+                or capabilities.is_admin
+                or obj.author_id == request.user.id
             )
         return False
 
@@ -23,8 +50,7 @@ class AnonymModeratorAdminAuthor(permissions.BasePermission):
 class IsAdmin(permissions.BasePermission):
     """Allow access for superuser or for user with admin role."""
     def has_permission(self, request, view):
-        user = request.user
-        return user.is_authenticated and user.is_admin()
+        return get_capabilities(request.user).is_admin
 
 
 class IsAdminOrReadOnly(permissions.BasePermission):
@@ -33,10 +59,7 @@ class IsAdminOrReadOnly(permissions.BasePermission):
     And read only access for others.
     """
     def has_permission(self, request, view):
-        user = request.user
         return (
             request.method in permissions.SAFE_METHODS
-            or (
-                user.is_authenticated and user.is_admin()
-            )
+            or get_capabilities(request.user).is_admin
         )
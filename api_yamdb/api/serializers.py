@@ -1,7 +1,8 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
-from reviews.models import Category, Comments, Genre, Review, Title
+from reviews.models import (SCORES, Category, Comments, Genre, Review,
+                            ScoreHistogram, Title)
 
 from .validate import validate_year
 
@@ -25,15 +26,35 @@ class GenreSerializer(serializers.ModelSerializer):
 
 class TitleReadSerializer (serializers.ModelSerializer):
     """Title serializer for GET request."""
-    rating = serializers.IntegerField()
+    rating = serializers.IntegerField(read_only=True)
+    weighted_rating = serializers.FloatField(read_only=True)
     genre = GenreSerializer(many=True)
     category = CategorySerializer()
 
     class Meta:
-        fields = '__all__'
+        fields = (
+            'id', 'name', 'year', 'rating', 'weighted_rating',
+            'description', 'genre', 'category',
+        )
         model = Title
 
 
+class TitleDetailSerializer(TitleReadSerializer):
+    """Title serializer for GET request of one title."""
+    score_histogram = serializers.SerializerMethodField()
+
+    class Meta(TitleReadSerializer.Meta):
+        fields = TitleReadSerializer.Meta.fields + ('score_histogram',)
+
+    def get_score_histogram(self, obj):
+        """Number of reviews with each score, from 1 to 10."""
+        try:
+            counts = obj.histogram.counts()
+        except ScoreHistogram.DoesNotExist:
+            counts = [0] * len(SCORES)
+        return dict(zip(SCORES, counts))
+
+
 class TitleWriteSerializer(serializers.ModelSerializer):
     """Title serializer for POST, PATCH request."""
     genre = serializers.SlugRelatedField(
@@ -46,7 +67,7 @@ class TitleWriteSerializer(serializers.ModelSerializer):
     year = serializers.IntegerField(validators=[validate_year])
 
     class Meta:
-        fields = '__all__'
+        fields = ('id', 'name', 'year', 'description', 'genre', 'category')
         model = Title
 
 
@@ -82,7 +103,7 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Review
-        fields = "__all__"
+        fields = ('id', 'author', 'title', 'text', 'score', 'pub_date')
         read_only_fields = ('id', 'pub_date', 'author', 'title')
 
     def validate_score(self, score):
@@ -91,20 +112,6 @@ class ReviewSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("invalid value")
         return score
 
-    def validate(self, data):
-        title_id = self.context.get(
-            'request').parser_context['kwargs']['title_id']
-        author = self.context.get('request').user
-        review = Review.objects.filter(
-            title_id=title_id,
-            author=author
-        )
-        if review.exists() and self.context.get('request').method == 'POST':
-            raise serializers.ValidationError(
-                'Вы уже писали отзыв на это произведение.'
-            )
-        return data
-
 
 class CommentsSerializer(serializers.ModelSerializer):
     """Serializer for comments requests."""
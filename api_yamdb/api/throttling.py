@@ -0,0 +1,346 @@
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from collections.abc import Mapping
+from contextlib import contextmanager
+from functools import lru_cache
+
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .permissions import get_capabilities
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+
+
+@lru_cache(maxsize=None)
+def parse_window(rate):
+    """Turn '<requests>/<period>' into (requests, period in seconds)."""
+    requests, period = rate.split('/')
+    return int(requests), PERIODS[period[0]]
+
+
+def parse_rate(rate):
+    """
+    Turn '<requests>/<period>' into (bucket size, tokens per second):
+    the bucket holds a burst of <requests> and refills in one period.
+    """
+    requests, period = parse_window(rate)
+    return requests, requests / period
+
+
+def refill(tokens, stamp, capacity, rate, now):
+    return min(capacity, tokens + max(0.0, now - stamp) * rate)
+
+
+class CacheBuckets:
+    """
+    Token buckets kept in the Django cache, shared by every worker that
+    uses the same cache server. Like the DRF throttles, a bucket is read
+    and written back without a lock, so concurrent requests may
+    occasionally both get its last token.
+    """
+
+    def take(self, key, capacity, rate, now):
+        """Take a token; return 0 or the seconds until one is available."""
+        tokens, stamp = cache.get(key) or (capacity, now)
+        tokens = refill(tokens, stamp, capacity, rate, now)
+        if tokens < 1:
+            return (1 - tokens) / rate
+        cache.set(key, (tokens - 1, now), int(capacity / rate) + 1)
+        return 0
+
+    def incr(self, key, delta, now, timeout):
+        """Add `delta` to a counter and return its new value."""
+        try:
+            return cache.incr(key, delta)
+        except ValueError:
+            if cache.add(key, delta, timeout):
+                return delta
+            return cache.incr(key, delta)
+
+    def value(self, key):
+        return cache.get(key, 0)
+
+
+class SharedMemoryBuckets:
+    """
+    Token buckets in a memory mapped file, for a single host whose
+    workers each have their own local memory cache.
+    A bucket key is hashed to one of `ways` neighbouring slots of
+    (key hash, tokens, timestamp); when all of them are taken, the
+    longest unused bucket is replaced. Counters share the slots, with
+    the count in place of the tokens. Updates hold an flock on the
+    file, so workers started from the same master process each open it
+    again instead of sharing the inherited descriptor.
+    """
+    slot = struct.Struct('<Qdd')
+
+    def __init__(self, slots=65536, ways=4):
+        self.slots = slots
+        self.ways = ways
+        self._lock = threading.Lock()
+        self._owner = None
+        self._fd = None
+        self._map = None
+
+    def _open(self):
+        owner = (os.getpid(), settings.THROTTLE_SHARED_PATH)
+        if self._owner == owner:
+            return
+        if self._owner is not None:
+            self._map.close()
+            os.close(self._fd)
+        size = self.slots * self.slot.size
+        os.makedirs(os.path.dirname(owner[1]), mode=0o700, exist_ok=True)
+        fd = os.open(owner[1], os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(fd).st_size < size:
+            os.ftruncate(fd, size)
+        self._fd, self._map = fd, mmap.mmap(fd, size)
+        self._owner = owner
+
+    def _find(self, key_hash):
+        """Return the offset and state of the bucket, None if it is new."""
+        first = key_hash % self.slots
+        victim, oldest = None, None
+        for way in range(self.ways):
+            offset = (first + way) % self.slots * self.slot.size
+            slot_hash, tokens, stamp = self.slot.unpack_from(
+                self._map, offset)
+            if slot_hash == key_hash:
+                return offset, (tokens, stamp)
+            if slot_hash == 0:
+                stamp = float('-inf')
+            if oldest is None or stamp < oldest:
+                victim, oldest = offset, stamp
+        return victim, None
+
+    @staticmethod
+    def _hash(key):
+        return int.from_bytes(
+            hashlib.blake2b(key.encode(), digest_size=8).digest(),
+            'little') or 1
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            self._open()
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def take(self, key, capacity, rate, now):
+        """Take a token; return 0 or the seconds until one is available."""
+        key_hash = self._hash(key)
+        with self._locked():
+            offset, state = self._find(key_hash)
+            tokens, stamp = state or (capacity, now)
+            tokens = refill(tokens, stamp, capacity, rate, now)
+            if tokens < 1:
+                return (1 - tokens) / rate
+            self.slot.pack_into(self._map, offset, key_hash, tokens - 1, now)
+            return 0
+
+    def incr(self, key, delta, now, timeout):
+        """Add `delta` to a counter and return its new value."""
+        key_hash = self._hash(key)
+        with self._locked():
+            offset, state = self._find(key_hash)
+            count = (state[0] if state else 0) + delta
+            self.slot.pack_into(self._map, offset, key_hash, count, now)
+            return count
+
+    def value(self, key):
+        key_hash = self._hash(key)
+        with self._locked():
+            _, state = self._find(key_hash)
+            return state[0] if state else 0
+
+    def clear(self):
+        with self._locked():
+            self._map[:] = bytes(len(self._map))
+
+
+cache_buckets = CacheBuckets()
+shared_buckets = SharedMemoryBuckets()
+
+
+def bucket_store():
+    """
+    Return the token bucket store chosen by THROTTLE_STORAGE; 'auto'
+    falls back to shared memory when the cache is local to the process
+    or, like the file based cache, has no atomic incr.
+    """
+    storage = settings.THROTTLE_STORAGE
+    if storage == 'auto':
+        local = settings.CACHES['default']['BACKEND'].endswith(
+            ('LocMemCache', 'FileBasedCache'))
+        storage = 'shared' if local and fcntl is not None else 'cache'
+    return shared_buckets if storage == 'shared' else cache_buckets
+
+
+class AuthThrottle(BaseThrottle):
+    """
+    Token bucket throttle of an anonymous auth endpoint.
+    The request takes a token from the bucket of its IP address, of each
+    of its `identity_fields` values and from the global bucket of the
+    scope, in that order, and is rejected at the first empty one, so an
+    abusive client does not drain the buckets of everybody else.
+    Bucket sizes come from AUTH_THROTTLE_RATES: '<scope>-ip',
+    '<scope>-identity' and '<scope>'.
+    """
+    scope = None
+    identity_fields = ()
+
+    def buckets(self, request):
+        yield f'{self.scope}-ip', self.get_ident(request) or ''
+        data = request.data
+        if isinstance(data, Mapping):
+            for field in self.identity_fields:
+                value = data.get(field)
+                if isinstance(value, str) and value.strip():
+                    yield f'{self.scope}-identity', value.strip().lower()
+        yield self.scope, ''
+
+    def allow_request(self, request, view):
+        store = bucket_store()
+        now = time.time()
+        self.delay = None
+        for name, value in self.buckets(request):
+            rate = settings.AUTH_THROTTLE_RATES.get(name)
+            if rate is None:
+                continue
+            capacity, tokens_per_second = parse_rate(rate)
+            digest = hashlib.md5(value.encode()).hexdigest()
+            self.delay = store.take(f'throttle:{name}:{digest}', capacity,
+                                    tokens_per_second, now)
+            if self.delay:
+                return False
+        return True
+
+    def wait(self):
+        return self.delay
+
+
+class SignUpThrottle(AuthThrottle):
+    scope = 'signup'
+    identity_fields = ('username', 'email')
+
+
+class TokenThrottle(AuthThrottle):
+    scope = 'token'
+    identity_fields = ('username',)
+
+
+class SlidingWindowCounter:
+    """
+    Requests of a key over the last `window` seconds, estimated from
+    fixed window counters: the count of the current window plus the part
+    of the previous one still inside the sliding window.
+    Counters live in the bucket_store(), so with a local memory cache the
+    workers of a host still share them. A hit is reserved by increasing
+    the counter first and taken back when it does not fit, so concurrent
+    requests can not overshoot the limit between a check and a write.
+    """
+
+    def keys(self, key, window, now):
+        current = int(now // window)
+        return f'{key}:{current}', f'{key}:{current - 1}'
+
+    def hit(self, key, limit, window, count, now):
+        """
+        Count `count` more requests and return 0 if they fit into the
+        limit; otherwise leave the counters as they were and return the
+        seconds until they may fit.
+        """
+        store = bucket_store()
+        current_key, previous_key = self.keys(key, window, now)
+        timeout = int(2 * window) + 1
+        current = store.incr(current_key, count, now, timeout)
+        previous = store.value(previous_key)
+        remaining = 1 - now % window / window
+        excess = previous * remaining + current - limit
+        if excess <= 0:
+            return 0
+        store.incr(current_key, -count, now, timeout)
+        if excess < previous * remaining:
+            return excess / previous * window
+        return remaining * window
+
+    def release(self, key, window, count, now):
+        """Take back requests counted by hit()."""
+        current_key, _ = self.keys(key, window, now)
+        bucket_store().incr(current_key, -count, now, int(2 * window) + 1)
+
+
+windows = SlidingWindowCounter()
+
+
+class WriteThrottle(BaseThrottle):
+    """
+    Role aware limit of writes per user over a sliding window.
+    The limit of the view `throttle_scope` is taken from
+    WRITE_THROTTLE_RATES[scope][role]; roles without a rate are not
+    limited. Safe methods are never throttled.
+    """
+
+    def charges(self, request, view):
+        """Return (scope, number of writes) pairs of the request."""
+        return ((view.throttle_scope, 1),)
+
+    def allow_request(self, request, view):
+        self.delay = None
+        if request.method in SAFE_METHODS:
+            return True
+        capabilities = get_capabilities(request.user)
+        if not capabilities.authenticated:
+            return True
+        if capabilities.is_admin:
+            role = 'admin'
+        elif capabilities.is_moderator:
+            role = 'moderator'
+        else:
+            role = 'user'
+        now = time.time()
+        hits = []
+        for scope, count in self.charges(request, view):
+            rate = settings.WRITE_THROTTLE_RATES.get(scope, {}).get(role)
+            if rate is None or not count:
+                continue
+            limit, window = parse_window(rate)
+            key = f'throttle:{scope}:{request.user.pk}'
+            self.delay = windows.hit(key, limit, window, count, now)
+            if self.delay:
+                for hit in hits:
+                    windows.release(*hit, now)
+                return False
+            hits.append((key, window, count))
+        return True
+
+    def wait(self):
+        return self.delay
+
+
+class BatchWriteThrottle(WriteThrottle):
+    """Every item of a batch request counts as a write."""
+
+    def charges(self, request, view):
+        data = request.data if isinstance(request.data, Mapping) else {}
+        return tuple(
+            (scope, len(items) if isinstance(items, list) else 0)
+            for scope, items in (('review-write', data.get('reviews')),
+                                 ('comment-write', data.get('comments')))
+        )
@@ -2,8 +2,8 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from .views import (CategoryViewSet, CommentsViewSet, GenreViewSet,
-                    ReviewViewSet, TitleViewSet, UserViewSet, create_token,
-                    sign_up)
+                    ReviewViewSet, TitleViewSet, UserViewSet, batch_create,
+                    create_token, export_data, sign_up)
 
 router = DefaultRouter()
 router.register(r'titles/(?P<title_id>\d+)/reviews', ReviewViewSet,
@@ -22,6 +22,8 @@ auth_urls = [
 ]
 
 urlpatterns = [
+    path('v1/batch/', batch_create, name='batch'),
+    path('v1/export/', export_data, name='export'),
     path('v1/', include(router.urls)),
     path('v1/auth/', include(auth_urls))
 ]
@@ -1,24 +1,46 @@
+from collections.abc import Mapping
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import (filters, mixins, pagination, permissions, status,
                             viewsets)
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import (action, api_view,
+                                       authentication_classes,
+                                       permission_classes, throttle_classes)
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
-from reviews.models import Category, Genre, Review, Title
-
-from .customfilters import TitlesFilter
+from rest_framework.settings import api_settings
+from reviews.export import export_records, json_lines, ndjson_lines
+from reviews.facets import title_facets
+from reviews.models import Category, Comments, Genre, Review, Title
+from reviews.rankings import update_title_rankings
+from reviews.rating import update_title_rating
+from users.confirmation import check_confirmation_code, make_confirmation_code
+from users.outbox import queue_email
+
+from .authentication import RoleAccessToken
+from .batch import (DUPLICATE_REVIEW, bulk_insert, prepare_comments,
+                    prepare_reviews, update_ratings)
+from .cache import CatalogCacheMixin, bump_catalog_version
+from .customfilters import FullTextSearchFilter, TitlesFilter
+from .mixins import NestedResourceMixin
+from .pagination import FeedPagination
 from .permissions import AnonymModeratorAdminAuthor, IsAdmin, IsAdminOrReadOnly
 from .serializers import (CategorySerializer, CommentsSerializer,
                           GenreSerializer, ReviewSerializer, SignUpSerializer,
-                          TitleReadSerializer, TitleWriteSerializer,
-                          TokenRequestSerializer, UserSerializer)
+                          TitleDetailSerializer, TitleReadSerializer,
+                          TitleWriteSerializer, TokenRequestSerializer,
+                          UserSerializer)
+from .throttling import (BatchWriteThrottle, SignUpThrottle, TokenThrottle,
+                         WriteThrottle)
 
 User = get_user_model()
 
@@ -30,66 +52,77 @@ class CustomGetOrPostViewSet(mixins.CreateModelMixin,
     pass
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(NestedResourceMixin, viewsets.ModelViewSet):
     """Review endpoint handler."""
     serializer_class = ReviewSerializer
     permission_classes = (
         permissions.IsAuthenticatedOrReadOnly, AnonymModeratorAdminAuthor,
     )
+    pagination_class = FeedPagination
+    filter_backends = (FullTextSearchFilter,)
+    throttle_classes = (WriteThrottle,)
+    throttle_scope = 'review-write'
 
     def get_queryset(self):
-        title = get_object_or_404(Title, id=self.kwargs['title_id'])
-        return title.review.all()
+        return self.get_title().review.select_related('author')
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, id=self.kwargs['title_id'])
-        serializer.save(author=self.request.user,
-                        title=title)
-
+        """
+        Insert the review and let the unique_review constraint reject
+        a second review of the same author, instead of checking first.
+        """
+        title = self.get_title()
+        try:
+            with transaction.atomic():
+                review = serializer.save(author=self.request.user,
+                                         title=title)
+                update_title_rating(title.id, added=[review.score])
+                update_title_rankings(title.id, new_reviews=1)
+        except IntegrityError:
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Вы уже писали отзыв на это произведение.'
+                ]
+            })
+
+    @transaction.atomic
     def perform_update(self, serializer):
-        title = get_object_or_404(Title, id=self.kwargs['title_id'])
-        serializer.save(author=self.request.user,
-                        title=title)
+        title = self.get_title()
+        old_score = serializer.instance.score
+        review = serializer.save(author=self.request.user,
+                                 title=title)
+        update_title_rating(title.id, added=[review.score],
+                            removed=[old_score])
+        update_title_rankings(title.id)
 
 
-class CommentsViewSet(viewsets.ModelViewSet):
+class CommentsViewSet(NestedResourceMixin, viewsets.ModelViewSet):
     """Comments endpoint handler."""
     permission_classes = (
         permissions.IsAuthenticatedOrReadOnly, AnonymModeratorAdminAuthor,
     )
     serializer_class = CommentsSerializer
+    pagination_class = FeedPagination
+    filter_backends = (FullTextSearchFilter,)
+    throttle_classes = (WriteThrottle,)
+    throttle_scope = 'comment-write'
 
     def get_queryset(self):
         """Overriding the get_queryset() method."""
-        review = get_object_or_404(
-            Review,
-            id=self.kwargs.get('review_id'),
-            title__id=self.kwargs.get('title_id')
-        )
-        return review.comments.all()
+        return self.get_review().comments.select_related('author')
 
     def perform_create(self, serializer):
         """Overriding the perform_create() method."""
-        review = get_object_or_404(
-            Review,
-            id=self.kwargs.get('review_id'),
-            title__id=self.kwargs.get('title_id')
-        )
         serializer.save(
-            review=review,
+            review=self.get_review(),
             author=self.request.user)
 
     def perform_update(self, serializer):
         """Overriding the perform_update() method."""
-        review = get_object_or_404(
-            Review,
-            id=self.kwargs.get('review_id'),
-            title__id=self.kwargs.get('title_id')
-        )
-        serializer.save(review=review, author=self.request.user)
+        serializer.save(review=self.get_review(), author=self.request.user)
 
 
-class CategoryViewSet(CustomGetOrPostViewSet):
+class CategoryViewSet(CatalogCacheMixin, CustomGetOrPostViewSet):
     """Category endpoint handler."""
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
@@ -100,7 +133,7 @@ class CategoryViewSet(CustomGetOrPostViewSet):
     lookup_field = 'slug'
 
 
-class GenreViewSet(CustomGetOrPostViewSet):
+class GenreViewSet(CatalogCacheMixin, CustomGetOrPostViewSet):
     """Genre endpoint handler."""
     queryset = Genre.objects.all()
     permission_classes = (IsAdminOrReadOnly,)
@@ -111,17 +144,77 @@ class GenreViewSet(CustomGetOrPostViewSet):
     lookup_field = 'slug'
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(CatalogCacheMixin, viewsets.ModelViewSet):
     """Title endpoint handler."""
-    queryset = Title.objects.annotate(
-        rating=Avg('review__score')
-    )
+    queryset = Title.objects.all()
     permission_classes = (IsAdminOrReadOnly,)
     pagination_class = PageNumberPagination
-    filter_backends = (filters.SearchFilter, DjangoFilterBackend,)
+    filter_backends = (FullTextSearchFilter, DjangoFilterBackend,)
     filterset_class = TitlesFilter
 
+    def get_queryset(self):
+        """Load category and genres of the whole page up front."""
+        if self.action == 'destroy':
+            return self.queryset
+        queryset = self.queryset.select_related('category')
+        if self.action == 'retrieve':
+            queryset = queryset.select_related('histogram')
+        return queryset.prefetch_related(
+            Prefetch('genre', queryset=Genre.objects.all())
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs)
+
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """Number of titles per genre, category and year."""
+        return self.cached_response(self.get_facets, request)
+
+    @action(detail=False, methods=['get'])
+    def top(self, request):
+        """
+        Highest rated titles, overall or within the `category` or
+        `genre` given by slug.
+        """
+        return self.cached_response(self.get_leaderboard, request, 'top')
+
+    @action(detail=False, methods=['get'])
+    def trending(self, request):
+        """Titles with the most reviews within TRENDING_WINDOW_DAYS."""
+        return self.cached_response(
+            self.get_leaderboard, request, 'trending')
+
+    def get_leaderboard(self, request, board):
+        group = 0
+        params = request.query_params
+        if board == 'top' and params.get('category'):
+            board = 'top-category'
+            group = get_object_or_404(Category, slug=params['category']).id
+        elif board == 'top' and params.get('genre'):
+            board = 'top-genre'
+            group = get_object_or_404(Genre, slug=params['genre']).id
+        try:
+            size = min(int(params.get('size', settings.LEADERBOARD_SIZE)),
+                       settings.LEADERBOARD_MAX_SIZE)
+        except ValueError:
+            size = settings.LEADERBOARD_SIZE
+        titles = self.get_queryset().filter(
+            rankings__board=board, rankings__group=group,
+            rankings__score__isnull=False,
+        ).order_by('-rankings__score', 'id')[:max(size, 0)]
+        return Response(self.get_serializer(titles, many=True).data)
+
+    def get_facets(self, request):
+        params = {*TitlesFilter.base_filters, api_settings.SEARCH_PARAM}
+        if params.isdisjoint(request.query_params):
+            return Response(title_facets())
+        return Response(title_facets(self.filter_queryset(self.queryset)))
+
     def get_serializer_class(self):
+        if self.action == 'retrieve':
+            return TitleDetailSerializer
         if self.request.method == 'GET':
             return TitleReadSerializer
         return TitleWriteSerializer
@@ -137,6 +230,15 @@ class UserViewSet(viewsets.ModelViewSet):
     lookup_field = 'username'
     permission_classes = (IsAdmin,)
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        """
+        Run the revoke_changed_tokens pre_save receiver and the save
+        in one transaction, so a revocation is never left without
+        the change that caused it.
+        """
+        serializer.save()
+
     @action(
         url_path='me',
         methods=['get'],
@@ -145,7 +247,7 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def get_current_user_info(self, request):
         """Retrieve the current user profile data."""
-        user = request.user
+        user = get_object_or_404(User, pk=request.user.pk)
         serializer = UserSerializer(user)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -159,12 +261,14 @@ class UserViewSet(viewsets.ModelViewSet):
             context={'request': request}
         )
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        self.perform_update(serializer)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 @api_view(['POST'])
+@authentication_classes([])
 @permission_classes([permissions.AllowAny])
+@throttle_classes([TokenThrottle])
 def create_token(request):
     """Handle JWT token POST request."""
     username = request.data.get('username', None)
@@ -177,37 +281,110 @@ def create_token(request):
     serializer.is_valid(raise_exception=True)
     user = get_object_or_404(User, username=username)
 
-    if not default_token_generator.check_token(
-            user, confirmation_code
-    ) and not confirmation_code == user.confirmation_code:
+    if not check_confirmation_code(username, confirmation_code):
         return Response(
             'Invalid confirmation code.',
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    token = RefreshToken.for_user(user)
+    token = RoleAccessToken.for_user(user)
     response = {
-        'token': str(token.access_token)
+        'token': str(token)
     }
     return Response(response, status=status.HTTP_200_OK)
 
 
 @api_view(['POST'])
+@authentication_classes([])
 @permission_classes([permissions.AllowAny])
+@throttle_classes([SignUpThrottle])
 def sign_up(request):
     """Handle signup POST requests."""
     serializer = SignUpSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
 
-    user = serializer.save()
+    with transaction.atomic():
+        user = serializer.save()
 
-    confirmation_code = default_token_generator.make_token(user)
-    user.confirmation_code = confirmation_code
-    send_mail(
-        settings.CONFIRMATION_EMAIL_HEADER,
-        confirmation_code,
-        settings.CONFIRMATION_EMAIL_SENDER,
-        (user.email,)
-    )
+        confirmation_code = make_confirmation_code(user)
+        queue_email(
+            settings.CONFIRMATION_EMAIL_HEADER,
+            confirmation_code,
+            user.email,
+        )
 
     return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+@throttle_classes([BatchWriteThrottle])
+def batch_create(request):
+    """
+    Create reviews and comments of the current user in one request.
+    Items are validated together, valid ones are inserted with
+    bulk_create in one transaction and every item gets its own result.
+    """
+    if not isinstance(request.data, Mapping):
+        return Response(
+            'Expected an object with `reviews` and `comments` lists.',
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    reviews = request.data.get('reviews', [])
+    comments = request.data.get('comments', [])
+    if not isinstance(reviews, list) or not isinstance(comments, list):
+        return Response(
+            '`reviews` and `comments` must be lists.',
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(reviews) + len(comments) > settings.BATCH_MAX_ITEMS:
+        return Response(
+            f'No more than {settings.BATCH_MAX_ITEMS} items per request.',
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    review_results, new_reviews = prepare_reviews(reviews, request)
+    comment_results, new_comments = prepare_comments(comments, request)
+    try:
+        with transaction.atomic():
+            bulk_insert(Review, new_reviews, request.user)
+            bulk_insert(Comments, new_comments, request.user)
+            update_ratings(new_reviews)
+            if new_reviews:
+                transaction.on_commit(bump_catalog_version)
+    except IntegrityError:
+        return Response(
+            {api_settings.NON_FIELD_ERRORS_KEY: [DUPLICATE_REVIEW]},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    response = {
+        'reviews': review_results,
+        'comments': comment_results,
+    }
+    return Response(response, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def export_data(request):
+    """
+    Stream titles, reviews and comments as NDJSON (or a JSON array with
+    `?output=json`). `updated_since` limits the rows to recent changes.
+    """
+    updated_since = request.query_params.get('updated_since')
+    if updated_since is not None:
+        updated_since = parse_datetime(updated_since)
+        if updated_since is None:
+            return Response(
+                'updated_since must be an ISO 8601 date and time.',
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if timezone.is_naive(updated_since):
+            updated_since = timezone.make_aware(updated_since)
+    records = export_records(updated_since)
+    if request.query_params.get('output') == 'json':
+        return StreamingHttpResponse(
+            json_lines(records), content_type='application/json')
+    return StreamingHttpResponse(
+        ndjson_lines(records), content_type='application/x-ndjson')
@@ -1,7 +1,16 @@
+"""
+ASGI config for YaMDb project.
+
+Django 2.2 has no ASGI handler, so the WSGI application is served
+through ThreadPoolASGIHandler, e.g. `uvicorn api_yamdb.asgi:application`.
+"""
+
 import os
 
-from django.core.asgi import get_asgi_application
+from django.core.wsgi import get_wsgi_application
+
+from .asgi_handler import ThreadPoolASGIHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+application = ThreadPoolASGIHandler(get_wsgi_application())
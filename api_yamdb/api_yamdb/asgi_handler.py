@@ -0,0 +1,172 @@
+import asyncio
+import io
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from rest_framework.permissions import SAFE_METHODS
+
+from django.conf import settings
+
+
+def build_environ(scope, body):
+    """Translate an ASGI HTTP scope into a WSGI environ."""
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode().decode('latin1'),
+        'PATH_INFO': scope['path'].encode().decode('latin1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+    for name, value in scope.get('headers', ()):
+        name = name.decode('latin1').upper().replace('-', '_')
+        if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            name = f'HTTP_{name}'
+        value = value.decode('latin1')
+        if name in environ:
+            value = f'{environ[name]},{value}'
+        environ[name] = value
+    environ['CONTENT_LENGTH'] = str(len(body))
+    return environ
+
+
+class ThreadPoolASGIHandler:
+    """
+    ASGI application serving the Django WSGI application.
+    Django 2.2 has no async views, so the event loop takes care of the
+    connections (reading request bodies, writing responses to slow
+    clients) and only the view itself runs in a bounded thread pool.
+    Reads of ASGI_READ_PATHS get their own pool, so writes and exports
+    can not starve the catalog. Connections over ASGI_MAX_CONNECTIONS
+    get 503 right away.
+    """
+
+    def __init__(self, wsgi_application, read_threads=None, threads=None,
+                 max_connections=None):
+        self.wsgi_application = wsgi_application
+        self.read_paths = [re.compile(path)
+                           for path in settings.ASGI_READ_PATHS]
+        self.read_executor = ThreadPoolExecutor(
+            read_threads or settings.ASGI_READ_THREADS,
+            thread_name_prefix='asgi-read',
+        )
+        self.executor = ThreadPoolExecutor(
+            threads or settings.ASGI_THREADS,
+            thread_name_prefix='asgi',
+        )
+        self.max_connections = (max_connections
+                                or settings.ASGI_MAX_CONNECTIONS)
+        self.connections = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise ValueError(f"Unsupported scope type {scope['type']}")
+        if self.connections >= self.max_connections:
+            await self.reject(send)
+            return
+        self.connections += 1
+        try:
+            await self.handle(scope, receive, send)
+        finally:
+            self.connections -= 1
+
+    def executor_for(self, scope):
+        if scope['method'] in SAFE_METHODS and any(
+                path.match(scope['path']) for path in self.read_paths):
+            return self.read_executor
+        return self.executor
+
+    async def handle(self, scope, receive, send):
+        body = await self.read_body(receive)
+        if body is None:
+            return
+        loop = asyncio.get_running_loop()
+        start, content = await loop.run_in_executor(
+            self.executor_for(scope), self.run_wsgi,
+            build_environ(scope, body), loop, send,
+        )
+        if start is not None:
+            await send({'type': 'http.response.start', **start})
+        if scope['method'] == 'HEAD':
+            content = b''
+        await send({'type': 'http.response.body', 'body': content})
+
+    async def read_body(self, receive):
+        """Read the whole request body; None if the client went away."""
+        chunks = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body', False):
+                return b''.join(chunks)
+
+    def run_wsgi(self, environ, loop, send):
+        """
+        Call the WSGI application in a pool thread.
+        Regular responses are returned to the event loop whole. Streaming
+        responses keep the thread, because their database cursors can not
+        move between threads, and are sent from here chunk by chunk.
+        """
+        start = {}
+
+        def start_response(status, headers, exc_info=None):
+            start['status'] = int(status.split(' ', 1)[0])
+            start['headers'] = [
+                (name.lower().encode('latin1'), value.encode('latin1'))
+                for name, value in headers
+            ]
+
+        result = self.wsgi_application(environ, start_response)
+        try:
+            if not getattr(result, 'streaming', False):
+                return start, b''.join(result)
+
+            def push(message):
+                asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+            push({'type': 'http.response.start', **start})
+            if environ['REQUEST_METHOD'] != 'HEAD':
+                for chunk in result:
+                    push({'type': 'http.response.body', 'body': chunk,
+                          'more_body': True})
+            return None, b''
+        finally:
+            result.close()
+
+    async def reject(self, send):
+        await send({
+            'type': 'http.response.start',
+            'status': 503,
+            'headers': [(b'content-type', b'text/plain'),
+                        (b'retry-after', b'1')],
+        })
+        await send({'type': 'http.response.body',
+                    'body': b'Too many connections.'})
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.read_executor.shutdown(wait=False)
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
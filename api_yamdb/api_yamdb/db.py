@@ -0,0 +1,56 @@
+import random
+from contextvars import ContextVar
+
+from rest_framework.permissions import SAFE_METHODS
+
+from django.conf import settings
+
+_read_from_replica = ContextVar('read_from_replica', default=False)
+
+
+def tune_sqlite(sender, connection, **kwargs):
+    """Apply SQLITE_PRAGMAS to every new SQLite connection."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES
+            if alias.startswith('replica')]
+
+
+class ReplicaRouter:
+    """Send reads of safe-method requests to a replica, everything else
+    to the default database."""
+
+    def db_for_read(self, model, **hints):
+        replicas = replica_aliases()
+        if replicas and _read_from_replica.get():
+            return random.choice(replicas)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+class ReplicaRoutingMiddleware:
+    """Mark GET, HEAD and OPTIONS requests as safe to read from replicas."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _read_from_replica.set(request.method in SAFE_METHODS)
+        try:
+            return self.get_response(request)
+        finally:
+            _read_from_replica.reset(token)
@@ -17,14 +17,15 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'rest_framework',
-    'api',
-    'reviews',
-    'users',
+    'api.apps.ApiConfig',
+    'reviews.apps.ReviewsConfig',
+    'users.apps.UsersConfig',
     'django_filters',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api_yamdb.db.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -54,13 +55,60 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
-DATABASES = {
+# DB_ENGINE=postgresql switches to PostgreSQL with persistent connections;
+# DB_REPLICA_HOSTS is a comma separated list of read replicas.
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'yamdb'),
+            'USER': os.environ.get('DB_USER', 'postgres'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        }
+    }
+    replica_hosts = os.environ.get('DB_REPLICA_HOSTS', '').split(',')
+    for number, host in enumerate(filter(None, replica_hosts), start=1):
+        DATABASES[f'replica_{number}'] = {
+            **DATABASES['default'],
+            'HOST': host.strip(),
+            'TEST': {'MIRROR': 'default'},
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+            'OPTIONS': {'timeout': 20},
+        }
+    }
+
+# Applied to every new SQLite connection.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 20000,
+    'mmap_size': 256 * 1024 * 1024,
+}
+
+DATABASE_ROUTERS = ['api_yamdb.db.ReplicaRouter']
+
+# Use django.core.cache.backends.filebased.FileBasedCache with a directory
+# in CACHE_LOCATION to share the cache between worker processes.
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'yamdb'),
     }
 }
 
+CATALOG_CACHE_TIMEOUT = 60 * 5
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -94,7 +142,7 @@ AUTH_USER_MODEL = 'users.CustomUser'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.ClaimsJWTAuthentication',
     ),
 
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
@@ -108,13 +156,88 @@ REST_FRAMEWORK = {
         'django_filters.rest_framework.DjangoFilterBackend',
     ),
 
+    # Reverse proxies in front of the API: throttles key on the client
+    # address they add to X-Forwarded-For, and on REMOTE_ADDR with none.
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 0)),
+
 }
 
+# Weighted rating: the average is pulled towards RATING_PRIOR_MEAN (None
+# means the mean score of the catalog) until a title has about
+# RATING_MIN_VOTES reviews.
+RATING_PRIOR_MEAN = None
+RATING_MIN_VOTES = 10
+
+# Trending leaderboard counts reviews of the last TRENDING_WINDOW_DAYS;
+# `manage.py refresh_rankings` moves the window.
+TRENDING_WINDOW_DAYS = 7
+LEADERBOARD_SIZE = 10
+LEADERBOARD_MAX_SIZE = 100
+
+# Maximum number of reviews and comments in one batch request.
+BATCH_MAX_ITEMS = 1000
+
+# 'page' or 'cursor' pagination for review and comment lists.
+FEED_PAGINATION = os.environ.get('FEED_PAGINATION', 'page')
+
+# ASGI server (api_yamdb.asgi): views run in thread pools, catalog reads
+# in their own one.
+ASGI_READ_PATHS = (
+    r'^/api/v1/titles/(\d+/)?$',
+    r'^/api/v1/titles/\d+/reviews/$',
+    r'^/api/v1/titles/\d+/reviews/\d+/comments/$',
+)
+ASGI_READ_THREADS = int(os.environ.get('ASGI_READ_THREADS', 16))
+ASGI_THREADS = int(os.environ.get('ASGI_THREADS', 4))
+ASGI_MAX_CONNECTIONS = int(os.environ.get('ASGI_MAX_CONNECTIONS', 2000))
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, "sent_emails")
 
 CONFIRMATION_EMAIL_HEADER = 'YAMDb Confirmation Code'
 CONFIRMATION_EMAIL_SENDER = 'noreply@yamdb.local'
+CONFIRMATION_CODE_MAX_AGE = 60 * 60 * 24
+
+# 'thread' - background thread in the web process, which also drains the
+# outbox on its first request and again when a retry is due, 'worker' -
+# separate `manage.py send_emails --loop` process, 'sync' - inside the
+# request.
+EMAIL_OUTBOX_DELIVERY = os.environ.get('EMAIL_OUTBOX_DELIVERY', 'thread')
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 60
+# Seconds after which an email claimed by a sender that died is sent again.
+EMAIL_OUTBOX_CLAIM_TIMEOUT = 60 * 5
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=2),
 }
+# Seconds a user row stays cached for JWT authenticated writes.
+AUTH_USER_CACHE_TIMEOUT = 300
+# Seconds between reloads of the token revocation list in each process.
+TOKEN_REVOCATION_SYNC_INTERVAL = 30
+
+# Token buckets of auth/signup and auth/token per IP address, per
+# username/email and for all clients: '<burst>/<period>', the bucket
+# refills in one period. Remove a key to turn its bucket off.
+AUTH_THROTTLE_RATES = {
+    'signup-ip': '20/min',
+    'signup-identity': '5/min',
+    'signup': '50/s',
+    'token-ip': '30/min',
+    'token-identity': '10/min',
+    'token': '100/s',
+}
+# 'cache', 'shared' (memory mapped THROTTLE_SHARED_PATH, one host only) or
+# 'auto': shared with the local memory or file based cache. The
+# directory of THROTTLE_SHARED_PATH is created private to the user.
+THROTTLE_STORAGE = os.environ.get('THROTTLE_STORAGE', 'auto')
+THROTTLE_SHARED_PATH = os.environ.get(
+    'THROTTLE_SHARED_PATH', os.path.join(BASE_DIR, 'run', 'throttle'))
+# Review and comment writes per user over a sliding window, by role:
+# '<requests>/<period>'. Roles without a rate (admins) are not limited;
+# every item of a batch request counts. The counters are kept in the
+# THROTTLE_STORAGE store; several hosts need a cache with atomic incr.
+WRITE_THROTTLE_RATES = {
+    'review-write': {'user': '30/hour', 'moderator': '300/hour'},
+    'comment-write': {'user': '120/hour', 'moderator': '1200/hour'},
+}
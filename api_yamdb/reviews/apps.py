@@ -1,5 +1,57 @@
 from django.apps import AppConfig
+from django.db.models.signals import (m2m_changed, post_delete, post_migrate,
+                                      post_save, pre_delete, pre_save)
+
+
+def create_search_indexes(sender, using, **kwargs):
+    from .search import ensure_search_indexes
+    ensure_search_indexes(using)
 
 
 class ReviewsConfig(AppConfig):
     name = 'reviews'
+
+    def ready(self):
+        from django.contrib.auth import get_user_model
+
+        from . import facets, rankings, rating
+        from .models import Category, Genre, GenreTitle, Review, Title
+
+        post_migrate.connect(create_search_indexes, sender=self)
+        pre_save.connect(facets.remember_title_facets, sender=Title,
+                         dispatch_uid='facets-title-pre-save')
+        post_save.connect(facets.title_saved, sender=Title,
+                          dispatch_uid='facets-title-save')
+        post_delete.connect(facets.title_deleted, sender=Title,
+                            dispatch_uid='facets-title-delete')
+        post_save.connect(facets.genre_title_saved, sender=GenreTitle,
+                          dispatch_uid='facets-genre-title-save')
+        post_delete.connect(facets.genre_title_deleted, sender=GenreTitle,
+                            dispatch_uid='facets-genre-title-delete')
+        m2m_changed.connect(facets.genres_added, sender=Title.genre.through,
+                            dispatch_uid='facets-title-genres')
+        post_delete.connect(facets.genre_deleted, sender=Genre,
+                            dispatch_uid='facets-genre-delete')
+        post_delete.connect(facets.category_deleted, sender=Category,
+                            dispatch_uid='facets-category-delete')
+        post_save.connect(rankings.title_changed, sender=Title,
+                          dispatch_uid='rankings-title-save')
+        post_save.connect(rankings.genre_link_saved, sender=GenreTitle,
+                          dispatch_uid='rankings-genre-title-save')
+        post_delete.connect(rankings.genre_link_deleted, sender=GenreTitle,
+                            dispatch_uid='rankings-genre-title-delete')
+        m2m_changed.connect(rankings.genres_changed,
+                            sender=Title.genre.through,
+                            dispatch_uid='rankings-title-genres')
+        post_delete.connect(rankings.category_deleted, sender=Category,
+                            dispatch_uid='rankings-category-delete')
+        post_delete.connect(rating.review_deleted, sender=Review,
+                            dispatch_uid='rating-review-delete')
+        pre_delete.connect(rating.title_deleting, sender=Title,
+                           dispatch_uid='rating-title-pre-delete')
+        post_delete.connect(rating.title_gone, sender=Title,
+                            dispatch_uid='rating-title-delete')
+        pre_delete.connect(rating.author_deleting, sender=get_user_model(),
+                           dispatch_uid='rating-author-pre-delete')
+        post_delete.connect(rating.author_gone, sender=get_user_model(),
+                            dispatch_uid='rating-author-delete')
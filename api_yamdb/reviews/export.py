@@ -0,0 +1,85 @@
+import json
+from itertools import groupby
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Comments, GenreTitle, Review, Title
+
+TITLE_FIELDS = ('id', 'name', 'year', 'description', 'category__slug',
+                'rating', 'weighted_rating', 'rating_count', 'updated')
+REVIEW_FIELDS = ('id', 'title_id', 'author__username', 'text', 'score',
+                 'pub_date', 'updated')
+COMMENT_FIELDS = ('id', 'review_id', 'author__username', 'text', 'pub_date',
+                  'updated')
+
+
+def _since(queryset, updated_since, field='updated'):
+    if updated_since is None:
+        return queryset
+    return queryset.filter(**{f'{field}__gte': updated_since})
+
+
+def export_titles(updated_since=None, chunk_size=2000):
+    """
+    Yield titles with their genre slugs.
+    Titles and their genre links are read as two id-ordered streams and
+    merged, so memory use does not depend on the number of titles.
+    """
+    titles = _since(Title.objects.order_by('id'), updated_since)
+    links = _since(
+        GenreTitle.objects.order_by('title_id', 'genre_id'),
+        updated_since, 'title__updated',
+    ).values_list('title_id', 'genre__slug')
+    genres = groupby(links.iterator(chunk_size=chunk_size),
+                     key=lambda link: link[0])
+    title_id, slugs = next(genres, (None, ()))
+    for title in titles.values(*TITLE_FIELDS).iterator(chunk_size=chunk_size):
+        while title_id is not None and title_id < title['id']:
+            title_id, slugs = next(genres, (None, ()))
+        title['category'] = title.pop('category__slug')
+        title['genre'] = (
+            [slug for _, slug in slugs] if title_id == title['id'] else [])
+        yield 'title', title
+
+
+def export_reviews(updated_since=None, chunk_size=2000):
+    reviews = _since(Review.objects.order_by('id'), updated_since)
+    for review in reviews.values(*REVIEW_FIELDS).iterator(
+            chunk_size=chunk_size):
+        review['author'] = review.pop('author__username')
+        yield 'review', review
+
+
+def export_comments(updated_since=None, chunk_size=2000):
+    comments = _since(Comments.objects.order_by('id'), updated_since)
+    for comment in comments.values(*COMMENT_FIELDS).iterator(
+            chunk_size=chunk_size):
+        comment['author'] = comment.pop('author__username')
+        yield 'comment', comment
+
+
+def export_records(updated_since=None, chunk_size=2000):
+    """Yield (type, record) pairs of titles, reviews and comments."""
+    yield from export_titles(updated_since, chunk_size)
+    yield from export_reviews(updated_since, chunk_size)
+    yield from export_comments(updated_since, chunk_size)
+
+
+def _dump(record_type, record):
+    return json.dumps({'type': record_type, **record},
+                      cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def ndjson_lines(records):
+    """Encode the records as newline delimited JSON."""
+    for record_type, record in records:
+        yield _dump(record_type, record) + '\n'
+
+
+def json_lines(records):
+    """Encode the records as one JSON array, one element per line."""
+    separator = '[\n'
+    for record_type, record in records:
+        yield separator + _dump(record_type, record)
+        separator = ',\n'
+    yield '[]\n' if separator == '[\n' else '\n]\n'
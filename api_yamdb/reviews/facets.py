@@ -0,0 +1,165 @@
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from .models import Category, FacetCount, Genre, GenreTitle, Title
+from .signals import catalog_changed
+
+# Title ids per query when counting the facets of a filtered list.
+FACET_BATCH = 500
+
+
+def adjust_facet(facet, value, delta):
+    """Add `delta` to the number of titles with the facet value."""
+    if value is None or not delta:
+        return
+    counts = FacetCount.objects.filter(facet=facet, value=value)
+    if counts.update(count=F('count') + delta) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            FacetCount.objects.create(facet=facet, value=value, count=delta)
+    except IntegrityError:
+        counts.update(count=F('count') + delta)
+
+
+def remember_title_facets(sender, instance, raw=False, **kwargs):
+    """pre_save receiver: keep the stored category and year of a title."""
+    if instance._state.adding or raw:
+        instance._old_facets = (None, None)
+        return
+    instance._old_facets = Title.objects.filter(pk=instance.pk).values_list(
+        'category_id', 'year').first() or (None, None)
+
+
+def title_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    old_category, old_year = getattr(instance, '_old_facets', (None, None))
+    if instance.category_id != old_category:
+        adjust_facet('category', old_category, -1)
+        adjust_facet('category', instance.category_id, 1)
+    if instance.year != old_year:
+        adjust_facet('year', old_year, -1)
+        adjust_facet('year', instance.year, 1)
+
+
+def title_deleted(sender, instance, **kwargs):
+    """Genre counts follow from the deletion of the GenreTitle rows."""
+    adjust_facet('category', instance.category_id, -1)
+    adjust_facet('year', instance.year, -1)
+
+
+def genre_title_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        adjust_facet('genre', instance.genre_id, 1)
+
+
+def genre_title_deleted(sender, instance, **kwargs):
+    adjust_facet('genre', instance.genre_id, -1)
+
+
+def genres_added(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    m2m_changed receiver for Title.genre.
+    add() inserts the links with bulk_create, which sends no post_save;
+    remove() and clear() delete them with post_delete signals.
+    """
+    if action != 'post_add':
+        return
+    if reverse:
+        adjust_facet('genre', instance.pk, len(pk_set))
+    else:
+        for genre_id in pk_set:
+            adjust_facet('genre', genre_id, 1)
+
+
+def genre_deleted(sender, instance, **kwargs):
+    FacetCount.objects.filter(facet='genre', value=instance.pk).delete()
+
+
+def category_deleted(sender, instance, **kwargs):
+    """Titles lose the category by an UPDATE, without signals."""
+    FacetCount.objects.filter(facet='category', value=instance.pk).delete()
+
+
+def _grouped(queryset, field):
+    return (
+        queryset.order_by().exclude(**{f'{field}__isnull': True})
+        .values_list(field).annotate(count=Count('*'))
+    )
+
+
+def count_facets(title_ids=None):
+    """
+    Count titles per facet value with one grouped query per facet, for
+    every title or, in batches of FACET_BATCH, for a list of title ids.
+    """
+    if title_ids is None:
+        batches = [None]
+    else:
+        batches = [title_ids[start:start + FACET_BATCH]
+                   for start in range(0, len(title_ids), FACET_BATCH)]
+    counts = {'genre': Counter(), 'category': Counter(), 'year': Counter()}
+    for batch in batches:
+        titles = Title.objects.all()
+        links = GenreTitle.objects.all()
+        if batch is not None:
+            titles = titles.filter(id__in=batch)
+            links = links.filter(title_id__in=batch)
+        counts['genre'].update(dict(_grouped(links, 'genre_id')))
+        counts['category'].update(dict(_grouped(titles, 'category_id')))
+        counts['year'].update(dict(_grouped(titles, 'year')))
+    return {facet: dict(values) for facet, values in counts.items()}
+
+
+def stored_facets():
+    counts = {'genre': {}, 'category': {}, 'year': {}}
+    for facet, value, count in FacetCount.objects.filter(
+            count__gt=0).values_list('facet', 'value', 'count'):
+        counts[facet][value] = count
+    return counts
+
+
+def rebuild_facet_counts():
+    """Recalculate the whole FacetCount table."""
+    rows = [
+        FacetCount(facet=facet, value=value, count=count)
+        for facet, counts in count_facets().items()
+        for value, count in counts.items()
+    ]
+    FacetCount.objects.all().delete()
+    FacetCount.objects.bulk_create(rows)
+    catalog_changed.send(sender=None)
+    return len(rows)
+
+
+def title_facets(titles=None):
+    """
+    Return the number of titles per genre, category and year.
+    Without `titles` the counts come from the FacetCount table; for a
+    filtered title queryset they are counted over its ids, fetched
+    first: full-text search conditions name the title table and break
+    when the queryset is nested in a subquery.
+    """
+    if titles is None:
+        counts = stored_facets()
+    else:
+        counts = count_facets(
+            list(titles.order_by().values_list('id', flat=True)))
+    result = {}
+    for facet, model in (('genre', Genre), ('category', Category)):
+        objects = model.objects.filter(id__in=counts[facet]).values(
+            'id', 'name', 'slug')
+        result[facet] = sorted(
+            ({'name': obj['name'], 'slug': obj['slug'],
+              'count': counts[facet][obj['id']]} for obj in objects),
+            key=lambda item: (-item['count'], item['slug']),
+        )
+    result['year'] = [
+        {'year': year, 'count': count}
+        for year, count in sorted(counts['year'].items(),
+                                  key=lambda item: (-item[1], item[0]))
+    ]
+    return result
@@ -0,0 +1,43 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from reviews.models import Category, Comments, Genre, GenreTitle, Review, Title
+
+User = get_user_model()
+
+
+def main_queries():
+    """The main query of every viewset with placeholder ids."""
+    return (
+        ('TitleViewSet list', Title.objects.select_related('category')),
+        ('TitleViewSet genres prefetch',
+         Genre.objects.filter(titles__in=(1, 2, 3))),
+        ('TitlesFilter genre',
+         Title.objects.filter(genre__slug__contains='drama')),
+        ('ReviewViewSet list',
+         Review.objects.filter(title_id=1).select_related('author')),
+        ('ReviewSerializer unique check',
+         Review.objects.filter(title_id=1, author_id=1)),
+        ('CommentsViewSet list',
+         Comments.objects.filter(review_id=1).select_related('author')),
+        ('Titles of genre', GenreTitle.objects.filter(genre_id=1)),
+        ('Genre leaderboard',
+         Title.objects.filter(rankings__board='top-genre', rankings__group=1,
+                              rankings__score__isnull=False)
+         .order_by('-rankings__score', 'id')[:10]),
+        ('GenreViewSet list', Genre.objects.all()),
+        ('CategoryViewSet list', Category.objects.all()),
+        ('UserViewSet list', User.objects.order_by('id')),
+    )
+
+
+class Command(BaseCommand):
+    """Print the query plan of the main query of each viewset."""
+    help = 'Show EXPLAIN output for the queries behind the API viewsets.'
+
+    def handle(self, *args, **options):
+        for name, queryset in main_queries():
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(str(queryset.query))
+            self.stdout.write(queryset.explain())
+            self.stdout.write('')
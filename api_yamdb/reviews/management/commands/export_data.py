@@ -0,0 +1,42 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from reviews.export import export_records, json_lines, ndjson_lines
+
+
+class Command(BaseCommand):
+    """Dump titles, reviews and comments for offline analytics."""
+    help = 'Export titles, reviews and comments as NDJSON or JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default='-',
+            help='File to write to, "-" for standard output.',
+        )
+        parser.add_argument(
+            '--format', choices=('ndjson', 'json'), default='ndjson',
+        )
+        parser.add_argument(
+            '--updated-since',
+            help='Only rows changed since this ISO 8601 date and time.',
+        )
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        updated_since = None
+        if options['updated_since']:
+            updated_since = parse_datetime(options['updated_since'])
+            if updated_since is None:
+                raise CommandError('--updated-since must be a date and time.')
+            if timezone.is_naive(updated_since):
+                updated_since = timezone.make_aware(updated_since)
+        encode = json_lines if options['format'] == 'json' else ndjson_lines
+        lines = encode(export_records(updated_since, options['chunk_size']))
+        if options['output'] == '-':
+            sys.stdout.writelines(lines)
+            return
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            output.writelines(lines)
@@ -0,0 +1,203 @@
+import csv
+import os
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils.dateparse import parse_datetime
+
+from reviews.facets import rebuild_facet_counts
+from reviews.models import Category, Comments, Genre, GenreTitle, Review, Title
+from reviews.rankings import rebuild_rankings
+from reviews.rating import rebuild_title_ratings
+from reviews.rating_engine import recompute_weighted_ratings
+
+User = get_user_model()
+
+DATA_DIR = os.path.join(settings.BASE_DIR, 'static', 'data')
+
+
+@contextmanager
+def keep_pub_date(model):
+    """Let bulk_create store pub_date from the file instead of now()."""
+    field = model._meta.get_field('pub_date')
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    """Load the CSV dump from static/data into the database."""
+    help = 'Import users, catalog, reviews and comments from CSV files.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default=DATA_DIR,
+            help='Directory with the CSV files.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Number of rows inserted per query.',
+        )
+
+    def handle(self, *args, **options):
+        self.path = options['path']
+        self.batch_size = options['batch_size']
+        if self.batch_size < 1:
+            raise CommandError('--batch-size must be a positive number.')
+        files = (
+            ('users.csv', User, self.build_user),
+            ('category.csv', Category, self.build_category),
+            ('genre.csv', Genre, self.build_genre),
+            ('titles.csv', Title, self.build_title),
+            ('genre_title.csv', GenreTitle, self.build_genre_title),
+            ('review.csv', Review, self.build_review),
+            ('comments.csv', Comments, self.build_comment),
+        )
+        self.ids = {}
+        for filename, model, build in files:
+            self.ids[model] = set(
+                model.objects.values_list('id', flat=True).iterator()
+            )
+            self.import_file(filename, model, build)
+        with transaction.atomic():
+            rebuild_title_ratings()
+            recompute_weighted_ratings()
+            rebuild_facet_counts()
+            rebuild_rankings()
+
+    def import_file(self, filename, model, build):
+        """Stream one CSV file into the table in batches."""
+        file_path = os.path.join(self.path, filename)
+        if not os.path.exists(file_path):
+            self.stdout.write(self.style.WARNING(f'{filename}: not found'))
+            return
+        started = time.monotonic()
+        imported = skipped = 0
+        batch = []
+        csv_file = open(file_path, encoding='utf-8', newline='')
+        with csv_file, transaction.atomic():
+            for row in csv.DictReader(csv_file):
+                obj = build(row)
+                if obj is None:
+                    skipped += 1
+                    continue
+                batch.append(obj)
+                if len(batch) >= self.batch_size:
+                    imported += self.save_batch(model, batch)
+                    batch = []
+            imported += self.save_batch(model, batch)
+            self.reset_sequence(model)
+        elapsed = time.monotonic() - started
+        rate = imported / elapsed if elapsed else imported
+        self.stdout.write(self.style.SUCCESS(
+            f'{filename}: {imported} rows in {elapsed:.2f}s '
+            f'({rate:.0f} rows/sec), {skipped} skipped'
+        ))
+
+    def save_batch(self, model, batch):
+        """Insert the collected objects and remember their ids."""
+        if not batch:
+            return 0
+        if any(field.name == 'pub_date' for field in model._meta.fields):
+            with keep_pub_date(model):
+                model.objects.bulk_create(batch)
+        else:
+            model.objects.bulk_create(batch)
+        self.ids[model].update(obj.id for obj in batch)
+        return len(batch)
+
+    def reset_sequence(self, model):
+        """Move the id sequence past the imported ids."""
+        statements = connection.ops.sequence_reset_sql(no_style(), [model])
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    def resolve(self, model, value):
+        """Return the id if the referenced row exists, otherwise None."""
+        if not value:
+            return None
+        pk = int(value)
+        return pk if pk in self.ids[model] else None
+
+    def build_user(self, row):
+        if int(row['id']) in self.ids[User]:
+            return None
+        return User(
+            id=int(row['id']),
+            username=row['username'],
+            email=row['email'],
+            role=row['role'] or 'user',
+            bio=row['bio'],
+            first_name=row['first_name'],
+            last_name=row['last_name'],
+            password=make_password(None),
+        )
+
+    def build_category(self, row):
+        if int(row['id']) in self.ids[Category]:
+            return None
+        return Category(id=int(row['id']), name=row['name'],
+                        slug=row['slug'])
+
+    def build_genre(self, row):
+        if int(row['id']) in self.ids[Genre]:
+            return None
+        return Genre(id=int(row['id']), name=row['name'], slug=row['slug'])
+
+    def build_title(self, row):
+        if int(row['id']) in self.ids[Title]:
+            return None
+        return Title(
+            id=int(row['id']),
+            name=row['name'],
+            year=int(row['year']) if row['year'] else None,
+            description=row.get('description', ''),
+            category_id=self.resolve(Category, row['category']),
+        )
+
+    def build_genre_title(self, row):
+        title_id = self.resolve(Title, row['title_id'])
+        genre_id = self.resolve(Genre, row['genre_id'])
+        if int(row['id']) in self.ids[GenreTitle] or None in (
+                title_id, genre_id):
+            return None
+        return GenreTitle(id=int(row['id']), title_id=title_id,
+                          genre_id=genre_id)
+
+    def build_review(self, row):
+        title_id = self.resolve(Title, row['title_id'])
+        author_id = self.resolve(User, row['author'])
+        if int(row['id']) in self.ids[Review] or None in (
+                title_id, author_id):
+            return None
+        return Review(
+            id=int(row['id']),
+            title_id=title_id,
+            author_id=author_id,
+            text=row['text'],
+            score=int(row['score']),
+            pub_date=parse_datetime(row['pub_date']),
+        )
+
+    def build_comment(self, row):
+        review_id = self.resolve(Review, row['review_id'])
+        author_id = self.resolve(User, row['author'])
+        if int(row['id']) in self.ids[Comments] or None in (
+                review_id, author_id):
+            return None
+        return Comments(
+            id=int(row['id']),
+            review_id=review_id,
+            author_id=author_id,
+            text=row['text'],
+            pub_date=parse_datetime(row['pub_date']),
+        )
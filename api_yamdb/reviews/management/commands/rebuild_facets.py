@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.facets import rebuild_facet_counts
+
+
+class Command(BaseCommand):
+    """Recalculate the facet counts of the titles filter."""
+    help = 'Rebuild the number of titles per genre, category and year.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild_facet_counts()
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt {count} facet counts.')
+        )
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.rating import rebuild_title_ratings
+from reviews.rating_engine import recompute_weighted_ratings
+
+
+class Command(BaseCommand):
+    """Recalculate stored title ratings from the review table."""
+    help = ('Rebuild the stored average and weighted rating of every title '
+            'from its reviews.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of titles updated per query.',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        with transaction.atomic():
+            count = rebuild_title_ratings(batch_size=options['batch_size'])
+            recompute_weighted_ratings()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt ratings for {count} rated titles '
+            f'in {time.perf_counter() - started:.2f} s.'
+        ))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from reviews.search import rebuild_search_indexes
+
+
+class Command(BaseCommand):
+    """Recreate the full-text search indexes."""
+    help = 'Create missing full-text indexes and refill them from the data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default='default',
+            help='Database alias to rebuild the indexes in.',
+        )
+
+    def handle(self, *args, **options):
+        rebuild_search_indexes(options['database'])
+        self.stdout.write(self.style.SUCCESS('Search indexes rebuilt.'))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.rankings import rebuild_rankings
+
+
+class Command(BaseCommand):
+    """
+    Recalculate the leaderboards.
+    Run it periodically: it moves the trending window forward.
+    """
+    help = 'Rebuild the top-rated and trending title leaderboards.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild_rankings()
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt {count} leaderboard rows.')
+        )
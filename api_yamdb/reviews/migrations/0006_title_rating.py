@@ -0,0 +1,46 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:01
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_title_rating(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Title = apps.get_model('reviews', 'Title')
+    stats = (
+        Review.objects.order_by()
+        .values('title_id')
+        .annotate(total=Sum('score'), count=Count('id'))
+    )
+    for row in stats:
+        Title.objects.filter(pk=row['title_id']).update(
+            rating_sum=row['total'],
+            rating_count=row['count'],
+            rating=row['total'] / row['count'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_auto_20211120_1621'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(blank=True, null=True, verbose_name='Average review score'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Number of reviews'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, verbose_name='Sum of review scores'),
+        ),
+        migrations.RunPython(fill_title_rating, migrations.RunPython.noop),
+    ]
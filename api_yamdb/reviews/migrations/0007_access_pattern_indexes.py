@@ -0,0 +1,67 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_genre_titles(apps, schema_editor):
+    GenreTitle = apps.get_model('reviews', 'GenreTitle')
+    duplicates = (
+        GenreTitle.objects.order_by()
+        .values('title_id', 'genre_id')
+        .annotate(first_id=Min('id'), count=Count('id'))
+        .filter(count__gt=1)
+    )
+    for row in duplicates:
+        GenreTitle.objects.filter(
+            title_id=row['title_id'], genre_id=row['genre_id'],
+        ).exclude(id=row['first_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_rating'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='comments',
+            name='review',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='reviews.Review', verbose_name='review_comment'),
+        ),
+        migrations.AlterField(
+            model_name='genretitle',
+            name='genre',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='reviews.Genre', verbose_name='Genre_of_title'),
+        ),
+        migrations.AlterField(
+            model_name='genretitle',
+            name='title',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='reviews.Title', verbose_name='title_whith_genre'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='title',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='review', to='reviews.Title', verbose_name='title_review'),
+        ),
+        migrations.AddIndex(
+            model_name='comments',
+            index=models.Index(fields=['review', 'id'], name='comments_review_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='genretitle',
+            index=models.Index(fields=['genre', 'title'], name='genretitle_genre_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', 'id'], name='review_title_id_idx'),
+        ),
+        migrations.RunPython(
+            remove_duplicate_genre_titles, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='genretitle',
+            constraint=models.UniqueConstraint(fields=('title', 'genre'), name='unique_genre_title'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_access_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comments',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='date of last change'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='date of last change'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='date of last change'),
+        ),
+    ]
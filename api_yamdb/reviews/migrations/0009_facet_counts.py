@@ -0,0 +1,51 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:24
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_facet_counts(apps, schema_editor):
+    FacetCount = apps.get_model('reviews', 'FacetCount')
+    GenreTitle = apps.get_model('reviews', 'GenreTitle')
+    Title = apps.get_model('reviews', 'Title')
+    facets = (
+        ('genre', GenreTitle, 'genre_id'),
+        ('category', Title, 'category_id'),
+        ('year', Title, 'year'),
+    )
+    FacetCount.objects.bulk_create(
+        FacetCount(facet=facet, value=value, count=count)
+        for facet, model, field in facets
+        for value, count in model.objects.order_by()
+        .exclude(**{f'{field}__isnull': True})
+        .values_list(field).annotate(count=Count('*'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_updated_timestamps'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacetCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('facet', models.CharField(choices=[('genre', 'Genre'), ('category', 'Category'), ('year', 'Year')], max_length=10, verbose_name='facet')),
+                ('value', models.IntegerField(verbose_name='value')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='titles')),
+            ],
+            options={
+                'verbose_name': 'Facet count',
+                'verbose_name_plural': 'Facet counts',
+                'ordering': ('facet', 'value'),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='facetcount',
+            constraint=models.UniqueConstraint(fields=('facet', 'value'), name='unique_facet_value'),
+        ),
+        migrations.RunPython(fill_facet_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_rankings(apps, schema_editor):
+    """Top-rated boards; trending is filled by refresh_rankings."""
+    GenreTitle = apps.get_model('reviews', 'GenreTitle')
+    Title = apps.get_model('reviews', 'Title')
+    TitleRanking = apps.get_model('reviews', 'TitleRanking')
+    rows = []
+    for title_id, rating, category_id in Title.objects.values_list(
+            'id', 'rating', 'category_id'):
+        rows.append(TitleRanking(board='top', title_id=title_id,
+                                 score=rating))
+        if category_id is not None:
+            rows.append(TitleRanking(board='top-category', group=category_id,
+                                     title_id=title_id, score=rating))
+    for title_id, genre_id, rating in GenreTitle.objects.values_list(
+            'title_id', 'genre_id', 'title__rating'):
+        rows.append(TitleRanking(board='top-genre', group=genre_id,
+                                 title_id=title_id, score=rating))
+    TitleRanking.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_facet_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleRanking',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(choices=[('top', 'Top rated'), ('top-category', 'Top rated in category'), ('top-genre', 'Top rated in genre'), ('trending', 'Trending')], max_length=20, verbose_name='leaderboard')),
+                ('group', models.IntegerField(default=0, verbose_name='group')),
+                ('score', models.FloatField(blank=True, null=True, verbose_name='score')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rankings', to='reviews.Title', verbose_name='ranked_title')),
+            ],
+            options={
+                'verbose_name': 'Title ranking',
+                'verbose_name_plural': 'Title rankings',
+                'ordering': ('board', 'group', '-score'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='titleranking',
+            index=models.Index(fields=['board', 'group', '-score'], name='ranking_board_score_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='titleranking',
+            constraint=models.UniqueConstraint(fields=('board', 'group', 'title'), name='unique_title_ranking'),
+        ),
+        migrations.RunPython(fill_rankings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:30
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, Sum
+
+
+def fill_weighted_rating(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    totals = Title.objects.aggregate(total=Sum('rating_sum'),
+                                     count=Sum('rating_count'))
+    prior = settings.RATING_PRIOR_MEAN
+    if prior is None:
+        prior = totals['total'] / totals['count'] if totals['count'] else 5.5
+    min_votes = settings.RATING_MIN_VOTES
+    Title.objects.filter(rating_count__gt=0).update(
+        weighted_rating=(F('rating_sum') + min_votes * prior)
+        / (F('rating_count') + min_votes),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_title_rankings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='weighted_rating',
+            field=models.FloatField(blank=True, null=True, verbose_name='Average pulled towards the prior score'),
+        ),
+        migrations.RunPython(fill_weighted_rating,
+                             migrations.RunPython.noop),
+    ]
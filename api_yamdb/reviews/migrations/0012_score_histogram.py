@@ -0,0 +1,53 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:33
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_score_histograms(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    ScoreHistogram = apps.get_model('reviews', 'ScoreHistogram')
+    histograms = defaultdict(dict)
+    for title_id, score, count in (
+            Review.objects.order_by().values_list('title_id', 'score')
+            .annotate(count=Count('id'))):
+        histograms[title_id][f'score_{score}'] = count
+    ScoreHistogram.objects.bulk_create(
+        ScoreHistogram(title_id=title_id, **counts)
+        for title_id, counts in histograms.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_weighted_rating'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreHistogram',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='histogram', serialize=False, to='reviews.Title', verbose_name='title_histogram')),
+                ('score_1', models.PositiveIntegerField(default=0)),
+                ('score_2', models.PositiveIntegerField(default=0)),
+                ('score_3', models.PositiveIntegerField(default=0)),
+                ('score_4', models.PositiveIntegerField(default=0)),
+                ('score_5', models.PositiveIntegerField(default=0)),
+                ('score_6', models.PositiveIntegerField(default=0)),
+                ('score_7', models.PositiveIntegerField(default=0)),
+                ('score_8', models.PositiveIntegerField(default=0)),
+                ('score_9', models.PositiveIntegerField(default=0)),
+                ('score_10', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Score histogram',
+                'verbose_name_plural': 'Score histograms',
+            },
+        ),
+        migrations.RunPython(fill_score_histograms,
+                             migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:55
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def fill_rating_prior(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    RatingPrior = apps.get_model('reviews', 'RatingPrior')
+    totals = Title.objects.aggregate(total=Sum('rating_sum'),
+                                     count=Sum('rating_count'))
+    if totals['count']:
+        RatingPrior.objects.create(pk=1,
+                                   mean=totals['total'] / totals['count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_score_histogram'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RatingPrior',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mean', models.FloatField(verbose_name='Mean score')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Measured')),
+            ],
+            options={
+                'verbose_name': 'Rating prior',
+                'verbose_name_plural': 'Rating priors',
+            },
+        ),
+        migrations.RunPython(fill_rating_prior, migrations.RunPython.noop),
+    ]
@@ -69,6 +69,26 @@ class Title(models.Model):
         related_name='titles',
         verbose_name='Category_title',
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Sum of review scores',
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Number of reviews',
+    )
+    rating = models.FloatField(
+        blank=True,
+        null=True,
+        verbose_name='Average review score',
+    )
+    weighted_rating = models.FloatField(
+        blank=True,
+        null=True,
+        verbose_name='Average pulled towards the prior score',
+    )
+    updated = models.DateTimeField(
+        'date of last change', auto_now=True, db_index=True)
 
     class Meta:
         ordering = ('id',)
@@ -79,12 +99,71 @@ class Title(models.Model):
         return self.name
 
 
+SCORES = range(1, 11)
+
+
+class ScoreHistogram(models.Model):
+    """
+    Number of reviews of the title with each score.
+    The stored average and count of the title are derived from it.
+    """
+    title = models.OneToOneField(Title, on_delete=models.CASCADE,
+                                 primary_key=True, related_name='histogram',
+                                 verbose_name='title_histogram')
+    score_1 = models.PositiveIntegerField(default=0)
+    score_2 = models.PositiveIntegerField(default=0)
+    score_3 = models.PositiveIntegerField(default=0)
+    score_4 = models.PositiveIntegerField(default=0)
+    score_5 = models.PositiveIntegerField(default=0)
+    score_6 = models.PositiveIntegerField(default=0)
+    score_7 = models.PositiveIntegerField(default=0)
+    score_8 = models.PositiveIntegerField(default=0)
+    score_9 = models.PositiveIntegerField(default=0)
+    score_10 = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Score histogram'
+        verbose_name_plural = 'Score histograms'
+
+    def __str__(self):
+        return f'{self.title_id}: {self.counts()}'
+
+    def counts(self):
+        return [getattr(self, f'score_{score}') for score in SCORES]
+
+
+class RatingPrior(models.Model):
+    """
+    Mean score of the catalog measured by the last weighted rating
+    recompute, shared by every process that updates ratings.
+    """
+    mean = models.FloatField(verbose_name='Mean score')
+    updated = models.DateTimeField(auto_now=True, verbose_name='Measured')
+
+    class Meta:
+        verbose_name = 'Rating prior'
+        verbose_name_plural = 'Rating priors'
+
+    def __str__(self):
+        return str(self.mean)
+
+
 class GenreTitle(models.Model):
     genre = models.ForeignKey(Genre, on_delete=models.CASCADE,
+                              db_index=False,
                               verbose_name='Genre_of_title')
     title = models.ForeignKey(Title, on_delete=models.CASCADE,
+                              db_index=False,
                               verbose_name='title_whith_genre')
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['title', 'genre'],
+                                    name='unique_genre_title')]
+        indexes = [
+            models.Index(fields=['genre', 'title'],
+                         name='genretitle_genre_title_idx')]
+
     def __str__(self) -> str:
         return f'{self.genre.name} - {self.title.name}'
 
@@ -99,6 +178,7 @@ class Review(models.Model):
     title = models.ForeignKey(
         Title,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name='review',
         verbose_name='title_review',
     )
@@ -109,6 +189,8 @@ class Review(models.Model):
                     MaxValueValidator(10)])
     pub_date = models.DateTimeField(
         'date of publication review', auto_now_add=True, db_index=True)
+    updated = models.DateTimeField(
+        'date of last change', auto_now=True, db_index=True)
 
     class Meta:
         """Function for creating a unique combination."""
@@ -116,6 +198,9 @@ class Review(models.Model):
         constraints = [
             models.UniqueConstraint(fields=['author', 'title'],
                                     name='unique_review')]
+        indexes = [
+            models.Index(fields=['title', 'id'],
+                         name='review_title_id_idx')]
         verbose_name = 'Review'
         verbose_name_plural = 'Reviews'
 
@@ -128,16 +213,88 @@ class Comments(models.Model):
     author = models.ForeignKey(User, on_delete=models.CASCADE,
                                verbose_name='author_comment')
     review = models.ForeignKey(Review, on_delete=models.CASCADE,
+                               db_index=False,
                                related_name='comments',
                                verbose_name='review_comment')
     text = models.TextField()
     pub_date = models.DateTimeField(
         'date of publication comment', auto_now_add=True, db_index=True)
+    updated = models.DateTimeField(
+        'date of last change', auto_now=True, db_index=True)
 
     class Meta:
         ordering = ('id',)
+        indexes = [
+            models.Index(fields=['review', 'id'],
+                         name='comments_review_id_idx')]
         verbose_name = 'Comment'
         verbose_name_plural = 'Comments'
 
     def __str__(self):
         return self.text
+
+
+FACET_CHOICES = (
+    ('genre', 'Genre'),
+    ('category', 'Category'),
+    ('year', 'Year'),
+)
+
+
+class FacetCount(models.Model):
+    """
+    Number of titles per genre id, category id or year.
+    Kept up to date by signal receivers in reviews.facets.
+    """
+    facet = models.CharField(max_length=10, choices=FACET_CHOICES,
+                             verbose_name='facet')
+    value = models.IntegerField(verbose_name='value')
+    count = models.PositiveIntegerField(default=0, verbose_name='titles')
+
+    class Meta:
+        ordering = ('facet', 'value')
+        constraints = [
+            models.UniqueConstraint(fields=['facet', 'value'],
+                                    name='unique_facet_value')]
+        verbose_name = 'Facet count'
+        verbose_name_plural = 'Facet counts'
+
+    def __str__(self):
+        return f'{self.facet}={self.value}: {self.count}'
+
+
+LEADERBOARD_CHOICES = (
+    ('top', 'Top rated'),
+    ('top-category', 'Top rated in category'),
+    ('top-genre', 'Top rated in genre'),
+    ('trending', 'Trending'),
+)
+
+
+class TitleRanking(models.Model):
+    """
+    Score of a title on a leaderboard.
+    `group` is the category or genre id of per-category and per-genre
+    boards and 0 otherwise. Maintained by reviews.rankings.
+    """
+    board = models.CharField(max_length=20, choices=LEADERBOARD_CHOICES,
+                             verbose_name='leaderboard')
+    group = models.IntegerField(default=0, verbose_name='group')
+    title = models.ForeignKey(Title, on_delete=models.CASCADE,
+                              related_name='rankings',
+                              verbose_name='ranked_title')
+    score = models.FloatField(blank=True, null=True, verbose_name='score')
+
+    class Meta:
+        ordering = ('board', 'group', '-score')
+        constraints = [
+            models.UniqueConstraint(fields=['board', 'group', 'title'],
+                                    name='unique_title_ranking')]
+        indexes = [
+            models.Index(fields=['board', 'group', '-score'],
+                         name='ranking_board_score_idx')]
+        verbose_name = 'Title ranking'
+        verbose_name_plural = 'Title rankings'
+
+    def __str__(self):
+        return f'{self.board}/{self.group}: {self.title_id}'
@@ -0,0 +1,128 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.utils import timezone
+
+from .models import GenreTitle, Review, Title, TitleRanking
+from .signals import catalog_changed
+
+TOP_BOARDS = ('top', 'top-category', 'top-genre')
+
+
+def _top_rows(title_ids=None):
+    """Rows of every title, so review writes only have to update them."""
+    titles = Title.objects.all()
+    links = GenreTitle.objects.all()
+    if title_ids is not None:
+        titles = titles.filter(id__in=title_ids)
+        links = links.filter(title_id__in=title_ids)
+    genres = defaultdict(list)
+    for title_id, genre_id in links.values_list('title_id', 'genre_id'):
+        genres[title_id].append(genre_id)
+    rows = []
+    for title_id, rating, category_id in titles.values_list(
+            'id', 'rating', 'category_id'):
+        rows.append(TitleRanking(board='top', title_id=title_id,
+                                 score=rating))
+        if category_id is not None:
+            rows.append(TitleRanking(board='top-category', group=category_id,
+                                     title_id=title_id, score=rating))
+        rows.extend(
+            TitleRanking(board='top-genre', group=genre_id,
+                         title_id=title_id, score=rating)
+            for genre_id in genres[title_id]
+        )
+    return rows
+
+
+def _trending_rows():
+    since = timezone.now() - timedelta(days=settings.TRENDING_WINDOW_DAYS)
+    return [
+        TitleRanking(board='trending', title_id=title_id, score=count)
+        for title_id, count in Review.objects.filter(pub_date__gte=since)
+        .order_by().values_list('title_id').annotate(count=Count('id'))
+    ]
+
+
+def refresh_title_rankings(title_ids):
+    """Recreate the top-rated rows of the titles."""
+    TitleRanking.objects.filter(board__in=TOP_BOARDS,
+                                title_id__in=title_ids).delete()
+    TitleRanking.objects.bulk_create(_top_rows(title_ids))
+
+
+def add_trending(title_id, reviews):
+    """Count new reviews towards the trending score of the title."""
+    rows = TitleRanking.objects.filter(board='trending', title_id=title_id)
+    if rows.update(score=F('score') + reviews):
+        return
+    try:
+        with transaction.atomic():
+            TitleRanking.objects.create(board='trending', title_id=title_id,
+                                        score=reviews)
+    except IntegrityError:
+        rows.update(score=F('score') + reviews)
+
+
+def copy_title_ratings(title_ids):
+    """Copy the stored rating of the titles to their top-rated rows."""
+    rating = Title.objects.filter(pk=OuterRef('title_id')).values('rating')
+    TitleRanking.objects.filter(
+        board__in=TOP_BOARDS, title_id__in=title_ids,
+    ).update(score=Subquery(rating))
+
+
+def update_title_rankings(title_id, new_reviews=0):
+    """
+    Apply a review write to the leaderboards.
+    One UPDATE copies the stored title rating to its top-rated rows.
+    Reviews leave the trending window only on rebuild_rankings().
+    """
+    copy_title_ratings([title_id])
+    if new_reviews:
+        add_trending(title_id, new_reviews)
+
+
+def rebuild_rankings():
+    """Recalculate every leaderboard."""
+    TitleRanking.objects.all().delete()
+    rows = _top_rows() + _trending_rows()
+    TitleRanking.objects.bulk_create(rows)
+    catalog_changed.send(sender=None)
+    return len(rows)
+
+
+def title_changed(sender, instance, raw=False, **kwargs):
+    """post_save receiver: the category of the title may have changed."""
+    if not raw:
+        refresh_title_rankings([instance.pk])
+
+
+def genre_link_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        refresh_title_rankings([instance.title_id])
+
+
+def genre_link_deleted(sender, instance, **kwargs):
+    """
+    Only drop the row of the genre: the link may be deleted by a cascade
+    from its title, which must not get new rows.
+    """
+    TitleRanking.objects.filter(board='top-genre', group=instance.genre_id,
+                                title_id=instance.title_id).delete()
+
+
+def category_deleted(sender, instance, **kwargs):
+    """Titles lose the category by an UPDATE, without signals."""
+    TitleRanking.objects.filter(board='top-category',
+                                group=instance.pk).delete()
+
+
+def genres_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """m2m_changed receiver: add() sends no post_save for the links."""
+    if action != 'post_add':
+        return
+    refresh_title_rankings(pk_set if reverse else [instance.pk])
@@ -0,0 +1,161 @@
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import Coalesce, Now
+
+from .models import SCORES, Review, ScoreHistogram, Title
+from .rankings import copy_title_ratings, update_title_rankings
+from .rating_engine import (from_histogram, if_rated, rating_prior_expression,
+                            weighted_rating_expression)
+from .signals import catalog_changed
+
+
+def update_score_histogram(title_id, changes):
+    """Add the {score: delta} changes to the histogram of the title."""
+    histograms = ScoreHistogram.objects.filter(title_id=title_id)
+    fields = {f'score_{score}': F(f'score_{score}') + delta
+              for score, delta in changes.items()}
+    if histograms.update(**fields) or max(changes.values()) < 0:
+        return
+    try:
+        with transaction.atomic():
+            ScoreHistogram.objects.create(title_id=title_id, **{
+                f'score_{score}': max(delta, 0)
+                for score, delta in changes.items()
+            })
+    except IntegrityError:
+        histograms.update(**fields)
+
+
+def update_title_rating(title_id, added=(), removed=()):
+    """
+    Apply added and removed review scores to the title.
+    The histogram is updated with F() deltas, so concurrent review writes
+    can not lose each other's changes; the sum, count, average and
+    weighted rating of the title are then set from the histogram row in
+    a single UPDATE.
+    """
+    changes = Counter(added)
+    changes.subtract(removed)
+    changes = {score: delta for score, delta in changes.items() if delta}
+    if not changes:
+        return
+    update_score_histogram(title_id, changes)
+    setfrom_histogram(Title.objects.filter(pk=title_id))
+
+
+def setfrom_histogram(titles):
+    """Set the rating fields of the titles from their histogram rows."""
+    fields = from_histogram(
+        rating_sum=F('total'),
+        rating_count=F('votes'),
+        rating=if_rated(F('total') * 1.0 / F('votes')),
+        weighted_rating=if_rated(weighted_rating_expression(
+            F('total'), F('votes'), rating_prior_expression(),
+            settings.RATING_MIN_VOTES)),
+    )
+    titles.update(
+        rating_sum=Coalesce(fields['rating_sum'], 0),
+        rating_count=Coalesce(fields['rating_count'], 0),
+        rating=fields['rating'],
+        weighted_rating=fields['weighted_rating'],
+        updated=Now(),
+    )
+
+
+_deleting = threading.local()
+
+
+def _being_deleted(kind):
+    """Primary keys of the titles or authors deleted in this thread."""
+    if not hasattr(_deleting, kind):
+        setattr(_deleting, kind, set())
+    return getattr(_deleting, kind)
+
+
+def title_deleting(sender, instance, **kwargs):
+    """
+    pre_delete receiver: the reviews of the title go with it, so their
+    scores are not removed from its rating one by one.
+    """
+    _being_deleted('titles').add(instance.pk)
+
+
+def title_gone(sender, instance, **kwargs):
+    _being_deleted('titles').discard(instance.pk)
+
+
+def author_deleting(sender, instance, **kwargs):
+    """
+    pre_delete receiver: remove the scores of the author from every
+    reviewed title before the reviews are deleted, with one histogram
+    UPDATE per score value and one UPDATE of the titles and rankings,
+    however many titles the author reviewed.
+    """
+    reviews = Review.objects.filter(author=instance).exclude(
+        title_id__in=_being_deleted('titles'))
+    scores = reviews.order_by().values_list('score', flat=True).distinct()
+    for score in list(scores):
+        ScoreHistogram.objects.filter(
+            title_id__in=reviews.filter(score=score).values('title_id'),
+        ).update(**{f'score_{score}': F(f'score_{score}') - 1})
+    title_ids = reviews.values('title_id')
+    setfrom_histogram(Title.objects.filter(pk__in=title_ids))
+    copy_title_ratings(title_ids)
+    _being_deleted('authors').add(instance.pk)
+
+
+def author_gone(sender, instance, **kwargs):
+    _being_deleted('authors').discard(instance.pk)
+
+
+def review_deleted(sender, instance, **kwargs):
+    """
+    post_delete receiver: remove the score of a review deleted on its
+    own; reviews of a deleted title or author are handled above.
+    """
+    if (instance.title_id in _being_deleted('titles')
+            or instance.author_id in _being_deleted('authors')):
+        return
+    update_title_rating(instance.title_id, removed=[instance.score])
+    update_title_rankings(instance.title_id)
+
+
+def rebuild_score_histograms():
+    """Recount the histogram of every title with one grouped query."""
+    histograms = defaultdict(dict)
+    for title_id, score, count in (
+            Review.objects.order_by().values_list('title_id', 'score')
+            .annotate(count=Count('id')).iterator()):
+        histograms[title_id][f'score_{score}'] = count
+    ScoreHistogram.objects.all().delete()
+    ScoreHistogram.objects.bulk_create(
+        ScoreHistogram(title_id=title_id, **counts)
+        for title_id, counts in histograms.items()
+    )
+
+
+def rebuild_title_ratings(batch_size=1000):
+    """
+    Recount the score histograms and recalculate the stored rating of
+    every title from them.
+    """
+    rebuild_score_histograms()
+    Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+    titles = []
+    for histogram in ScoreHistogram.objects.iterator():
+        counts = histogram.counts()
+        total = sum(score * count for score, count in zip(SCORES, counts))
+        count = sum(counts)
+        if count:
+            titles.append(Title(pk=histogram.title_id, rating_sum=total,
+                                rating_count=count, rating=total / count))
+    Title.objects.bulk_update(
+        titles, ('rating_sum', 'rating_count', 'rating'),
+        batch_size=batch_size,
+    )
+    catalog_changed.send(sender=None)
+    return len(titles)
@@ -0,0 +1,87 @@
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db.models import (Case, Count, F, FloatField, OuterRef, Q,
+                              Subquery, Sum, Value, When)
+from django.db.models.functions import Coalesce
+
+from .models import SCORES, RatingPrior, ScoreHistogram, Title
+from .signals import catalog_changed
+
+# Middle of the 1-10 score scale, used until the first recompute has
+# measured the mean score of the catalog.
+DEFAULT_PRIOR = 5.5
+
+
+def rating_prior_expression():
+    """
+    The prior mean score: RATING_PRIOR_MEAN, or the catalog mean stored
+    by the last recompute_weighted_ratings(), read by the query using it.
+    """
+    if settings.RATING_PRIOR_MEAN is not None:
+        return Value(settings.RATING_PRIOR_MEAN, output_field=FloatField())
+    return Coalesce(Subquery(RatingPrior.objects.values('mean')[:1]),
+                    Value(DEFAULT_PRIOR), output_field=FloatField())
+
+
+def weighted_rating_expression(score_sum, votes, prior, min_votes):
+    """
+    (sum + m * C) / (votes + m): the average pulled towards the prior C
+    until the title has about m = RATING_MIN_VOTES reviews. Works on
+    numbers and query expressions alike.
+    """
+    return (score_sum + min_votes * prior) * 1.0 / (votes + min_votes)
+
+
+def histogram_totals():
+    """Sum of the scores and number of votes of a histogram row."""
+    return {
+        'total': sum((F(f'score_{score}') * score for score in SCORES),
+                     Value(0)),
+        'votes': sum((F(f'score_{score}') for score in SCORES), Value(0)),
+    }
+
+
+def from_histogram(**expressions):
+    """
+    Subqueries of each expression over the histogram row of the title,
+    which may use the `total` and `votes` of the histogram.
+    """
+    histogram = ScoreHistogram.objects.filter(
+        title_id=OuterRef('pk')).annotate(**histogram_totals())
+    return {
+        name: Subquery(histogram.annotate(value=expression).values('value'))
+        for name, expression in expressions.items()
+    }
+
+
+def if_rated(expression):
+    return Case(When(votes__gt=0, then=expression), default=Value(None),
+                output_field=FloatField())
+
+
+def recompute_weighted_ratings():
+    """
+    Recalculate the weighted rating of every title in the database: one
+    aggregate query measures the catalog mean and one UPDATE sets the
+    ratings from the histogram rows. Returns the number of rated titles.
+    """
+    totals = histogram_totals()
+    totals = ScoreHistogram.objects.aggregate(
+        total=Sum(totals['total']), votes=Sum(totals['votes']),
+        rated=Count('pk', filter=reduce(or_, (
+            Q(**{f'score_{score}__gt': 0}) for score in SCORES))),
+    )
+    prior = settings.RATING_PRIOR_MEAN
+    if prior is None:
+        prior = (totals['total'] / totals['votes'] if totals['votes']
+                 else DEFAULT_PRIOR)
+        RatingPrior.objects.update_or_create(pk=1, defaults={'mean': prior})
+    rating = from_histogram(weighted_rating=if_rated(
+        weighted_rating_expression(
+            F('total'), F('votes'), Value(prior, output_field=FloatField()),
+            settings.RATING_MIN_VOTES)))
+    Title.objects.update(weighted_rating=rating['weighted_rating'])
+    catalog_changed.send(sender=None)
+    return totals['rated']
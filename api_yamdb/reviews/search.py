@@ -0,0 +1,147 @@
+import re
+from functools import reduce
+from operator import and_, or_
+
+from django.db import connections
+from django.db.models import Q
+
+from .models import Comments, Review, Title
+
+SEARCH_FIELDS = {
+    Title: ('name', 'description'),
+    Review: ('text',),
+    Comments: ('text',),
+}
+
+
+def search_terms(text):
+    """Split the search string into words, dropping query syntax."""
+    return re.findall(r'\w+', text)
+
+
+def _columns(model):
+    return [model._meta.get_field(name).column
+            for name in SEARCH_FIELDS[model]]
+
+
+def _fts_table(model):
+    return f'{model._meta.db_table}_fts'
+
+
+def _ts_vector(model):
+    table = model._meta.db_table
+    document = " || ' ' || ".join(
+        f"coalesce({table}.{column}, '')" for column in _columns(model))
+    return f"to_tsvector('simple', {document})"
+
+
+def _sqlite_index_sql(model):
+    table = model._meta.db_table
+    fts = _fts_table(model)
+    columns = _columns(model)
+    names = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    delete_old = (
+        f"INSERT INTO {fts}({fts}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    insert_new = (
+        f'INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values});'
+    )
+    return (
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} '
+        f'BEGIN {insert_new} END',
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} '
+        f'BEGIN {delete_old} END',
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {names} '
+        f'ON {table} BEGIN {delete_old} {insert_new} END',
+    )
+
+
+def ensure_search_indexes(using='default'):
+    """
+    Create the full-text indexes if they are missing.
+    SQLite gets FTS5 tables kept in sync by triggers. Table rebuilds in
+    SQLite migrations drop triggers, so this runs after every migrate.
+    PostgreSQL gets GIN expression indexes over the tsvector.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        tables = connection.introspection.table_names(cursor)
+        for model in SEARCH_FIELDS:
+            if model._meta.db_table not in tables:
+                continue
+            if connection.vendor == 'sqlite':
+                fts = _fts_table(model)
+                if fts not in tables:
+                    cursor.execute(
+                        f'CREATE VIRTUAL TABLE {fts} USING fts5('
+                        f"{', '.join(_columns(model))}, "
+                        f"content='{model._meta.db_table}', "
+                        f"content_rowid='id', "
+                        f"tokenize='unicode61 remove_diacritics 2', "
+                        f"prefix='2 3')"
+                    )
+                    cursor.execute(
+                        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+                for sql in _sqlite_index_sql(model):
+                    cursor.execute(sql)
+            elif connection.vendor == 'postgresql':
+                cursor.execute(
+                    f'CREATE INDEX IF NOT EXISTS {_fts_table(model)} '
+                    f'ON {model._meta.db_table} '
+                    f'USING GIN ({_ts_vector(model)})'
+                )
+
+
+def rebuild_search_indexes(using='default'):
+    """Refill the SQLite full-text tables from their content tables."""
+    connection = connections[using]
+    ensure_search_indexes(using)
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for model in SEARCH_FIELDS:
+            fts = _fts_table(model)
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def full_text_search(queryset, text):
+    """
+    Filter the queryset by words of `text` (prefix match, all words must
+    be present) and order it by relevance.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return queryset
+    model = queryset.model
+    table = model._meta.db_table
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        fts = _fts_table(model)
+        return queryset.extra(
+            tables=[fts],
+            where=[f'{fts}.rowid = {table}.id', f'{fts} MATCH %s'],
+            params=[' '.join(f'"{term}"*' for term in terms)],
+            select={'search_rank': f'{fts}.rank'},
+            order_by=['search_rank', 'id'],
+        )
+    if vendor == 'postgresql':
+        vector = _ts_vector(model)
+        query = ' & '.join(f'{term}:*' for term in terms)
+        return queryset.extra(
+            where=[f"{vector} @@ to_tsquery('simple', %s)"],
+            params=[query],
+            select={
+                'search_rank':
+                    f"ts_rank({vector}, to_tsquery('simple', %s))",
+            },
+            select_params=[query],
+            order_by=['-search_rank', 'id'],
+        )
+    return queryset.filter(reduce(and_, (
+        reduce(or_, (Q(**{f'{field}__icontains': term})
+                     for field in SEARCH_FIELDS[model]))
+        for term in terms
+    )))
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent after stored catalog data was rebuilt in bulk, bypassing the
+# model signals: ratings, facet counts or leaderboards.
+catalog_changed = Signal()
@@ -1,5 +1,15 @@
 from django.contrib import admin
 
-from .models import CustomUser
+from .models import CustomUser, OutgoingEmail
+
+
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    """Class that configures the display of OutgoingEmail model. """
+    list_display = ('pk', 'recipient', 'subject', 'status', 'attempts',
+                    'created', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('recipient',)
+
 
 admin.site.register(CustomUser)
+admin.site.register(OutgoingEmail, OutgoingEmailAdmin)
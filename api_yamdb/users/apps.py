@@ -1,5 +1,19 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
+from django.db.models.signals import pre_delete, pre_save
 
 
 class UsersConfig(AppConfig):
     name = 'users'
+
+    def ready(self):
+        from .models import CustomUser
+        from .outbox import drain_on_first_request
+        from .revocation import revoke_changed_tokens, revoke_deleted_tokens
+
+        pre_save.connect(revoke_changed_tokens, sender=CustomUser,
+                         dispatch_uid='revoke-tokens-save')
+        pre_delete.connect(revoke_deleted_tokens, sender=CustomUser,
+                           dispatch_uid='revoke-tokens-delete')
+        request_started.connect(drain_on_first_request,
+                                dispatch_uid='outbox-first-request')
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signing import BadSignature, TimestampSigner
+
+signer = TimestampSigner(salt='users.confirmation')
+
+
+def make_confirmation_code(user):
+    """Return a signed, time-limited code with the username inside."""
+    return signer.sign(user.username)
+
+
+def check_confirmation_code(username, code):
+    """
+    Check the code signature, age and username without touching the DB.
+    A code is accepted only once: its signature is remembered in the cache
+    until it expires anyway.
+    """
+    max_age = settings.CONFIRMATION_CODE_MAX_AGE
+    try:
+        signed_username = signer.unsign(str(code), max_age=max_age)
+    except BadSignature:
+        return False
+    if signed_username != username:
+        return False
+    signature = str(code).rsplit(signer.sep, 1)[-1]
+    return cache.add(f'confirmation-code:{signature}', True, max_age)
@@ -0,0 +1,35 @@
+import time
+
+from users.outbox import send_pending
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """Deliver emails waiting in the outbox."""
+    help = 'Send pending outbox emails, once or in a loop.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling the outbox instead of exiting.',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=1.0,
+            help='Seconds to wait between polls in loop mode.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help='Number of emails fetched per query.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent = send_pending(batch_size=options['batch_size'])
+            if sent:
+                self.stdout.write(f'Sent {sent} emails.')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,17 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_outgoingemail'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='customuser',
+            name='confirmation_code',
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_remove_customuser_confirmation_code'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TokenRevocation',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_id', models.PositiveIntegerField(verbose_name='Пользователь')),
+                ('token_version', models.PositiveIntegerField(verbose_name='Версия токенов')),
+                ('created', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Создано')),
+            ],
+            options={
+                'verbose_name': 'Отзыв токенов',
+                'verbose_name_plural': 'Отзывы токенов',
+                'ordering': ('id',),
+            },
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='token_version',
+            field=models.PositiveIntegerField(default=0, verbose_name='Версия токенов'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_token_revocation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outgoingemail',
+            name='claim',
+            field=models.UUIDField(blank=True, db_index=True, editable=False, null=True, verbose_name='Метка отправителя'),
+        ),
+        migrations.AlterField(
+            model_name='outgoingemail',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Ожидает отправки'), ('sending', 'Отправляется'), ('sent', 'Отправлено'), ('failed', 'Ошибка')], default='pending', max_length=10, verbose_name='Статус'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 ROLE_CHOICES = (
     ('user', 'Пользователь'),
@@ -8,6 +9,13 @@ ROLE_CHOICES = (
     ('admin', 'Администратор'),
 )
 
+EMAIL_STATUS_CHOICES = (
+    ('pending', 'Ожидает отправки'),
+    ('sending', 'Отправляется'),
+    ('sent', 'Отправлено'),
+    ('failed', 'Ошибка'),
+)
+
 
 class CustomUserManager(BaseUserManager):
     """YaMDB User Manager."""
@@ -54,8 +62,9 @@ class CustomUser(AbstractUser):
         default='user',
         verbose_name='Роль'
     )
-    confirmation_code = models.CharField(
-        max_length=128, null=True, blank=True
+    token_version = models.PositiveIntegerField(
+        'Версия токенов',
+        default=0
     )
 
     objects = CustomUserManager()
@@ -71,3 +80,51 @@ class CustomUser(AbstractUser):
     class Meta:
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
+
+
+class OutgoingEmail(models.Model):
+    """Email stored in the outbox until a worker delivers it."""
+    subject = models.CharField('Тема', max_length=255)
+    body = models.TextField('Текст')
+    from_email = models.CharField('Отправитель', max_length=254)
+    recipient = models.EmailField('Получатель')
+    status = models.CharField(
+        max_length=10,
+        choices=EMAIL_STATUS_CHOICES,
+        default='pending',
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created = models.DateTimeField('Создано', auto_now_add=True)
+    send_after = models.DateTimeField('Отправить после', default=timezone.now)
+    sent_at = models.DateTimeField('Отправлено', null=True, blank=True)
+    claim = models.UUIDField('Метка отправителя', null=True, blank=True,
+                             db_index=True, editable=False)
+
+    class Meta:
+        ordering = ('id',)
+        indexes = (
+            models.Index(fields=('status', 'send_after')),
+        )
+        verbose_name = 'Письмо'
+        verbose_name_plural = 'Исходящие письма'
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
+
+
+class TokenRevocation(models.Model):
+    """Tokens of the user with a lower version are no longer accepted."""
+    user_id = models.PositiveIntegerField('Пользователь')
+    token_version = models.PositiveIntegerField('Версия токенов')
+    created = models.DateTimeField('Создано', auto_now_add=True,
+                                   db_index=True)
+
+    class Meta:
+        ordering = ('id',)
+        verbose_name = 'Отзыв токенов'
+        verbose_name_plural = 'Отзывы токенов'
+
+    def __str__(self):
+        return f'{self.user_id}: {self.token_version}'
@@ -0,0 +1,168 @@
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.signals import request_started
+from django.db import close_old_connections, transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=1,
+                               thread_name_prefix='email-outbox')
+_scheduled = threading.Event()
+_retry_lock = threading.Lock()
+_retry_timer = None
+
+
+def queue_email(subject, body, recipient):
+    """
+    Save an email to the outbox and schedule its delivery.
+    EMAIL_OUTBOX_DELIVERY selects who sends it: 'thread' drains the outbox
+    in a background thread of this process, 'worker' leaves it to
+    `manage.py send_emails`, 'sync' sends it before returning.
+    """
+    OutgoingEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=settings.CONFIRMATION_EMAIL_SENDER,
+        recipient=recipient,
+    )
+    delivery = settings.EMAIL_OUTBOX_DELIVERY
+    if delivery == 'sync':
+        transaction.on_commit(send_pending)
+    elif delivery == 'thread':
+        transaction.on_commit(_schedule_drain)
+
+
+def _schedule_drain():
+    """Submit one drain to the background thread unless one is waiting."""
+    if not _scheduled.is_set():
+        _scheduled.set()
+        _executor.submit(_drain)
+
+
+def _drain():
+    _scheduled.clear()
+    try:
+        send_pending()
+        _schedule_retry()
+    except Exception:
+        logger.exception('Email outbox delivery failed.')
+    finally:
+        close_old_connections()
+
+
+def _schedule_retry():
+    """
+    Drain the outbox again when its earliest unsent email is due: a
+    failed email waiting for its retry, or one claimed by a sender that
+    died. Each drain replaces the timer of the previous one.
+    """
+    global _retry_timer
+    due = OutgoingEmail.objects.filter(
+        status__in=('pending', 'sending'),
+    ).aggregate(due=Min('send_after'))['due']
+    with _retry_lock:
+        if _retry_timer is not None:
+            _retry_timer.cancel()
+            _retry_timer = None
+        if due is None:
+            return
+        delay = max(0.0, (due - timezone.now()).total_seconds())
+        _retry_timer = threading.Timer(delay, _schedule_drain)
+        _retry_timer.daemon = True
+        _retry_timer.start()
+
+
+def drain_on_first_request(sender, **kwargs):
+    """
+    request_started receiver: in 'thread' delivery, drain what earlier
+    processes left in the outbox once this one starts serving.
+    """
+    if settings.EMAIL_OUTBOX_DELIVERY != 'thread':
+        return
+    request_started.disconnect(dispatch_uid='outbox-first-request')
+    _schedule_drain()
+
+
+def _claim(batch_size):
+    """
+    Mark a batch of due emails as being sent by this process and return
+    them, or None when nothing is due.
+    The conditional UPDATE moves `send_after` of each claimed row forward,
+    so every email is claimed by one process only; emails of a sender
+    that died are claimed again after EMAIL_OUTBOX_CLAIM_TIMEOUT.
+    """
+    now = timezone.now()
+    due = OutgoingEmail.objects.filter(status__in=('pending', 'sending'),
+                                       send_after__lte=now)
+    ids = list(due.values_list('id', flat=True)[:batch_size])
+    if not ids:
+        return None
+    claim = uuid.uuid4()
+    due.filter(id__in=ids).update(
+        status='sending',
+        claim=claim,
+        send_after=now + timedelta(
+            seconds=settings.EMAIL_OUTBOX_CLAIM_TIMEOUT),
+    )
+    return list(OutgoingEmail.objects.filter(claim=claim))
+
+
+def send_pending(batch_size=None):
+    """
+    Deliver due outbox emails in batches over a single mail connection.
+    Each batch is claimed first, so several processes can drain the
+    outbox at once without sending an email twice. Failed emails are
+    retried later with a growing delay until EMAIL_OUTBOX_MAX_ATTEMPTS is
+    reached. Returns the number of sent emails.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    sent = 0
+    with get_connection() as connection:
+        while True:
+            emails = _claim(batch_size)
+            if emails is None:
+                break
+            for email in emails:
+                sent += _send(email, connection)
+            OutgoingEmail.objects.bulk_update(
+                emails,
+                ('status', 'attempts', 'last_error', 'send_after', 'sent_at'),
+            )
+    return sent
+
+
+def _send(email, connection):
+    """Try to send one email and record the outcome on the instance."""
+    message = EmailMessage(
+        email.subject,
+        email.body,
+        email.from_email,
+        (email.recipient,),
+        connection=connection,
+    )
+    email.attempts += 1
+    try:
+        message.send()
+    except Exception as error:
+        email.last_error = str(error)
+        if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            email.status = 'failed'
+        else:
+            email.status = 'pending'
+            email.send_after = timezone.now() + timedelta(
+                seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * email.attempts
+            )
+        return 0
+    email.status = 'sent'
+    email.sent_at = timezone.now()
+    return 1
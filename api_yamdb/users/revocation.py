@@ -0,0 +1,97 @@
+import threading
+import time
+
+from rest_framework_simplejwt.settings import api_settings
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import TokenRevocation
+
+# User fields carried by the access token claims or checked on login.
+TOKEN_FIELDS = ('role', 'is_staff', 'is_superuser', 'is_active')
+
+
+class RevocationList:
+    """
+    Minimal accepted token version per user, kept in process memory.
+    Only revocations younger than the access token lifetime matter, so
+    the map stays small. It is reloaded from the database every
+    TOKEN_REVOCATION_SYNC_INTERVAL seconds, and on the first check of a
+    new process; revocations made by this process are applied at once.
+    """
+
+    def __init__(self):
+        self._versions = {}
+        self._synced_at = float('-inf')
+        self._lock = threading.Lock()
+
+    def is_revoked(self, user_id, token_version):
+        if (time.monotonic() - self._synced_at
+                >= settings.TOKEN_REVOCATION_SYNC_INTERVAL):
+            self.sync()
+        return token_version < self._versions.get(user_id, 0)
+
+    def add(self, user_id, token_version):
+        with self._lock:
+            if token_version > self._versions.get(user_id, 0):
+                self._versions[user_id] = token_version
+
+    def sync(self):
+        """Reload the revocations of still valid tokens."""
+        since = timezone.now() - api_settings.ACCESS_TOKEN_LIFETIME
+        versions = dict(
+            TokenRevocation.objects.filter(created__gte=since)
+            .order_by().values('user_id')
+            .annotate(version=Max('token_version'))
+            .values_list('user_id', 'version')
+        )
+        with self._lock:
+            self._versions = versions
+            self._synced_at = time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._versions = {}
+            self._synced_at = time.monotonic()
+
+
+revocations = RevocationList()
+
+
+def revoke_tokens(user):
+    """Reject every token issued to the user so far."""
+    user.token_version += 1
+    type(user).objects.filter(pk=user.pk).update(
+        token_version=user.token_version)
+    TokenRevocation.objects.create(user_id=user.pk,
+                                   token_version=user.token_version)
+    user_id, version = user.pk, user.token_version
+    transaction.on_commit(lambda: revocations.add(user_id, version))
+
+
+def revoke_changed_tokens(sender, instance, raw=False, update_fields=None,
+                          **kwargs):
+    """
+    pre_save receiver: revoke the tokens of a user whose role claims or
+    is_active change, whatever code saves the user.
+    """
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not set(TOKEN_FIELDS) & set(
+            update_fields):
+        return
+    stored = sender.objects.filter(pk=instance.pk).values_list(
+        *TOKEN_FIELDS, 'token_version').first()
+    if stored is None or stored[:-1] == tuple(
+            getattr(instance, field) for field in TOKEN_FIELDS):
+        return
+    instance.token_version = stored[-1]
+    revoke_tokens(instance)
+
+
+def revoke_deleted_tokens(sender, instance, **kwargs):
+    """pre_delete receiver: tokens of a deleted user are not accepted."""
+    revoke_tokens(instance)
@@ -32,6 +32,18 @@ def auth_client(user):
     return client
 
 
+def bearer_client(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+def token_client(user):
+    """Client authenticated with the token issued by `auth/token/`."""
+    from api.authentication import RoleAccessToken
+    return bearer_client(RoleAccessToken.for_user(user))
+
+
 def create_categories(admin_client):
     data1 = {
         'name': 'Фильм',
@@ -1,6 +1,8 @@
 import os
 import sys
 
+import pytest
+
 from django.utils.version import get_version
 
 root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -34,3 +36,26 @@ assert get_version() < '3.0.0', 'Пожалуйста, используйте в
 pytest_plugins = [
     'tests.fixtures.fixture_user',
 ]
+
+
+@pytest.fixture(autouse=True)
+def deliver_emails_in_request(settings):
+    settings.EMAIL_OUTBOX_DELIVERY = 'sync'
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_revocations():
+    from users.revocation import revocations
+    revocations.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_throttles():
+    from api.throttling import shared_buckets
+    shared_buckets.clear()
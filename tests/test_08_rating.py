@@ -0,0 +1,140 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_reviews
+
+TITLES = 30
+CRITICS = 60
+
+
+def seed_reviews(django_user_model):
+    """CRITICS users, each of them reviewing each of TITLES titles."""
+    from reviews.models import Review, Title
+    from reviews.rankings import rebuild_rankings
+    from reviews.rating import rebuild_title_ratings
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {i}', year=2000) for i in range(TITLES))
+    django_user_model.objects.bulk_create(
+        django_user_model(username=f'critic{i}',
+                          email=f'critic{i}@yamdb.fake')
+        for i in range(CRITICS)
+    )
+    titles = list(Title.objects.all())
+    critics = list(
+        django_user_model.objects.filter(username__startswith='critic'))
+    Review.objects.bulk_create(
+        Review(title=title, author=critic, text='Отзыв',
+               score=(title.id + critic.id) % 10 + 1)
+        for title in titles for critic in critics
+    )
+    rebuild_title_ratings()
+    rebuild_rankings()
+    return titles, critics
+
+
+class Test08Rating:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_rating_stored(self, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        from reviews.models import Title
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert title.rating_count == 3 and title.rating_sum == 12, (
+            'Проверьте, что при создании отзыва обновляется сохранённый '
+            'рейтинг произведения'
+        )
+        admin_client.delete(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        )
+        title.refresh_from_db()
+        assert title.rating_count == 2 and title.rating == 3.5, (
+            'Проверьте, что при удалении отзыва обновляется сохранённый '
+            'рейтинг произведения'
+        )
+        other_title = Title.objects.get(pk=titles[1]['id'])
+        assert other_title.rating is None, (
+            'Проверьте, что рейтинг произведения без отзывов равен `None`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_rebuild_ratings(self, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        from reviews.models import Title
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+        call_command('rebuild_ratings')
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            12, 3, 4.0
+        ), (
+            'Проверьте, что команда `rebuild_ratings` пересчитывает '
+            'рейтинг произведений по отзывам'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_author_deleted(self, admin_client, admin):
+        from reviews.models import Title, TitleRanking
+        _, titles, user, _ = create_reviews(admin_client, admin)
+        title_id = titles[0]['id']
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == 204
+        title = Title.objects.select_related('histogram').get(pk=title_id)
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            9, 2, 4.5
+        ), (
+            'Проверьте, что при удалении пользователя его оценки '
+            'исключаются из рейтинга произведений'
+        )
+        assert title.histogram.counts() == [0, 0, 0, 1, 1, 0, 0, 0, 0, 0]
+        assert TitleRanking.objects.get(board='top', title=title).score == 4.5
+        Title.objects.get(pk=title_id).delete()
+        assert not Title.objects.filter(pk=title_id).exists()
+
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_title_deleted_queries(self, django_user_model):
+        from reviews.models import Title
+        titles, _ = seed_reviews(django_user_model)
+        with CaptureQueriesContext(connection) as context:
+            titles[0].delete()
+        assert len(context.captured_queries) < CRITICS, (
+            'Проверьте, что при удалении произведения рейтинг не '
+            'пересчитывается для каждого удаляемого отзыва'
+        )
+        other = Title.objects.get(pk=titles[1].pk)
+        other.review.first().delete()
+        other.refresh_from_db()
+        assert other.rating_count == CRITICS - 1, (
+            'Проверьте, что после удаления произведения отзывы других '
+            'произведений снова обновляют их рейтинг'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_author_deleted_queries(self, django_user_model):
+        from reviews.models import Title, TitleRanking
+        titles, critics = seed_reviews(django_user_model)
+        critic = critics[0]
+        expected = {}
+        for title in titles:
+            scores = list(title.review.exclude(author=critic)
+                          .values_list('score', flat=True))
+            expected[title.pk] = (sum(scores), len(scores),
+                                  sum(scores) / len(scores))
+        with CaptureQueriesContext(connection) as context:
+            critic.delete()
+        assert len(context.captured_queries) < TITLES, (
+            'Проверьте, что при удалении пользователя число запросов не '
+            'зависит от числа произведений с его отзывами'
+        )
+        assert {
+            title.pk: (title.rating_sum, title.rating_count, title.rating)
+            for title in Title.objects.all()
+        } == expected, (
+            'Проверьте, что при удалении пользователя его оценки '
+            'исключаются из рейтинга произведений'
+        )
+        assert {
+            ranking.title_id: ranking.score
+            for ranking in TitleRanking.objects.filter(board='top')
+        } == {pk: values[2] for pk, values in expected.items()}
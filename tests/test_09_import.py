@@ -0,0 +1,30 @@
+import pytest
+from django.core.management import call_command
+
+
+class Test09ImportCSV:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_import_csv(self):
+        from reviews.models import Comments, GenreTitle, Review, Title
+        call_command('import_csv', batch_size=10)
+        assert Title.objects.count() == 32, (
+            'Проверьте, что команда `import_csv` загружает произведения'
+        )
+        assert GenreTitle.objects.count() == 42, (
+            'Проверьте, что команда `import_csv` загружает жанры произведений'
+        )
+        assert Review.objects.count() == 72, (
+            'Проверьте, что команда `import_csv` загружает отзывы'
+        )
+        assert Comments.objects.count() == 3, (
+            'Проверьте, что команда `import_csv` загружает комментарии'
+        )
+        title = Title.objects.get(pk=1)
+        assert title.rating == 10 and title.rating_count == 2, (
+            'Проверьте, что после загрузки отзывов пересчитывается рейтинг'
+        )
+        call_command('import_csv')
+        assert Review.objects.count() == 72, (
+            'Проверьте, что повторный запуск `import_csv` не дублирует строки'
+        )
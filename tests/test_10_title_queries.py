@@ -0,0 +1,56 @@
+import pytest
+
+
+def create_catalog(titles_count):
+    from reviews.models import Category, Genre, GenreTitle, Title
+    category = Category.objects.create(name='Фильм', slug='films')
+    genres = [
+        Genre.objects.create(name='Ужасы', slug='horror'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {i}', year=2000, description='',
+              category=category)
+        for i in range(titles_count)
+    )
+    titles = Title.objects.all()
+    GenreTitle.objects.bulk_create(
+        GenreTitle(title=title, genre=genre)
+        for title in titles for genre in genres
+    )
+    return titles
+
+
+class Test10TitleQueries:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('titles_count', (3, 10))
+    def test_01_title_list_queries(self, client,
+                                   django_assert_num_queries, titles_count):
+        create_catalog(titles_count)
+        # count, titles with categories, genres of the page
+        with django_assert_num_queries(3):
+            response = client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        assert len(response.json()['results'][0]['genre']) == 2, (
+            'Проверьте, что при GET запросе `/api/v1/titles/` '
+            'возвращаются жанры произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_detail_queries(self, client,
+                                     django_assert_num_queries):
+        titles = create_catalog(3)
+        with django_assert_num_queries(2):
+            response = client.get(f'/api/v1/titles/{titles[0].id}/')
+        assert response.status_code == 200
+        assert response.json()['category']['slug'] == 'films'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_title_filtered_list_queries(self, client,
+                                            django_assert_num_queries):
+        create_catalog(10)
+        with django_assert_num_queries(3):
+            response = client.get('/api/v1/titles/?category=films&year=2000')
+        assert response.status_code == 200
+        assert response.json()['count'] == 10
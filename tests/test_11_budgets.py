@@ -0,0 +1,234 @@
+import itertools
+import json
+import os
+import statistics
+import time
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import token_client
+
+# Set BUDGET_REPORT=path/to/report.json to save the measurements.
+REPORT_PATH = os.environ.get('BUDGET_REPORT')
+REPEAT = 20
+
+USERS = 50
+TITLES = 200
+COMMENTS = 100
+
+# name, method, url, client, data, max queries, p50 ms, p95 ms;
+# streamed responses are timed until their last chunk.
+BUDGETS = (
+    ('titles-list', 'get', '/api/v1/titles/', 'anon', None, 3, 30, 80),
+    ('titles-filtered', 'get', '/api/v1/titles/?genre=genre-1&year=2000',
+     'anon', None, 3, 30, 80),
+    ('titles-search', 'get', '/api/v1/titles/?search=произведение',
+     'anon', None, 3, 30, 80),
+    ('titles-detail', 'get', '/api/v1/titles/{title}/', 'anon', None,
+     2, 20, 60),
+    ('titles-facets', 'get', '/api/v1/titles/facets/', 'anon', None,
+     3, 20, 60),
+    ('titles-top', 'get', '/api/v1/titles/top/', 'anon', None, 2, 20, 60),
+    ('titles-top-genre', 'get', '/api/v1/titles/top/?genre=genre-1', 'anon',
+     None, 3, 20, 60),
+    ('titles-trending', 'get', '/api/v1/titles/trending/', 'anon', None,
+     2, 20, 60),
+    ('reviews-list', 'get', '/api/v1/titles/{title}/reviews/', 'anon', None,
+     3, 30, 80),
+    ('reviews-cursor', 'get',
+     '/api/v1/titles/{title}/reviews/?pagination=cursor', 'anon', None,
+     2, 30, 80),
+    ('reviews-detail', 'get', '/api/v1/titles/{title}/reviews/{review}/',
+     'anon', None, 2, 20, 60),
+    ('comments-list', 'get',
+     '/api/v1/titles/{title}/reviews/{review}/comments/', 'anon', None,
+     3, 30, 80),
+    ('comments-detail', 'get',
+     '/api/v1/titles/{title}/reviews/{review}/comments/{comment}/', 'anon',
+     None, 2, 20, 60),
+    ('genres-list', 'get', '/api/v1/genres/', 'anon', None, 2, 20, 60),
+    ('categories-list', 'get', '/api/v1/categories/', 'anon', None,
+     2, 20, 60),
+    ('users-list', 'get', '/api/v1/users/', 'admin', None, 2, 30, 80),
+    ('users-detail', 'get', '/api/v1/users/{username}/', 'admin', None,
+     1, 20, 60),
+    ('users-me', 'get', '/api/v1/users/me/', 'user', None, 1, 20, 60),
+    ('auth-signup', 'post', '/api/v1/auth/signup/', 'anon', 'signup',
+     5, 40, 120),
+    ('auth-token', 'post', '/api/v1/auth/token/', 'anon', 'token',
+     1, 30, 80),
+    ('batch', 'post', '/api/v1/batch/', 'user', 'batch', 10, 60, 150),
+    ('export', 'get', '/api/v1/export/', 'admin', None, 4, 1500, 3000),
+)
+# Reviews and comments of every batch request.
+BATCH_ITEMS = 5
+
+
+def seed():
+    """Create a synthetic catalog with reviews and comments."""
+    from django.contrib.auth import get_user_model
+    from reviews.models import (Category, Comments, Genre, GenreTitle, Review,
+                                Title)
+    from reviews.facets import rebuild_facet_counts
+    from reviews.rankings import rebuild_rankings
+    from reviews.rating import rebuild_title_ratings
+    User = get_user_model()
+
+    User.objects.bulk_create(
+        User(username=f'bench{i}', email=f'bench{i}@yamdb.fake')
+        for i in range(USERS)
+    )
+    users = list(User.objects.all())
+    Category.objects.bulk_create(
+        Category(name=f'Категория {i}', slug=f'category-{i}')
+        for i in range(5)
+    )
+    categories = list(Category.objects.all())
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {i}', slug=f'genre-{i}') for i in range(10)
+    )
+    genres = list(Genre.objects.all())
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {i}', year=2000 - i % 3, description='',
+              category=categories[i % len(categories)])
+        for i in range(TITLES)
+    )
+    titles = list(Title.objects.all())
+    GenreTitle.objects.bulk_create(
+        GenreTitle(title=title, genre=genres[(title.id + shift) % 10])
+        for title in titles for shift in range(2)
+    )
+    Review.objects.bulk_create(
+        (Review(title=title, author=user, text='Отзыв',
+                score=(title.id + user.id) % 10 + 1)
+         for title, user in itertools.product(titles, users))
+    )
+    review = Review.objects.filter(title=titles[0]).first()
+    Comments.objects.bulk_create(
+        Comments(review=review, author=users[i % USERS], text='Комментарий')
+        for i in range(COMMENTS)
+    )
+    rebuild_title_ratings()
+    rebuild_facet_counts()
+    rebuild_rankings()
+    return {
+        'title': titles[0].id,
+        'review': review.id,
+        'comment': review.comments.first().id,
+        'username': users[0].username,
+        'titles': [title.id for title in titles],
+    }
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+class Test11Budgets:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_route_budgets(self, admin, user, settings):
+        from api.cache import bump_catalog_version
+        from django.contrib.auth import get_user_model
+        from users.confirmation import make_confirmation_code
+        User = get_user_model()
+        # Mail is sent outside of the request in production.
+        settings.EMAIL_OUTBOX_DELIVERY = 'worker'
+        settings.WRITE_THROTTLE_RATES = {
+            'review-write': {'user': '1000/hour'},
+            'comment-write': {'user': '1000/hour'},
+        }
+        ids = seed()
+        clients = {
+            'anon': APIClient(),
+            'admin': token_client(admin),
+            'user': token_client(user),
+        }
+        counter = itertools.count()
+        batches = itertools.count()
+        # Requests come from many clients, as auth endpoints are
+        # throttled per IP address.
+        addresses = (f'10.0.{i // 256}.{i % 256}' for i in itertools.count())
+
+        def payload(kind):
+            if kind == 'signup':
+                number = next(counter)
+                return {'username': f'signup{number}',
+                        'email': f'signup{number}@yamdb.fake'}
+            if kind == 'token':
+                # Every code is accepted once, so log in as seeded users.
+                bench_user = User.objects.get(username=f'bench{next(counter)}')
+                return {'username': bench_user.username,
+                        'confirmation_code':
+                            make_confirmation_code(bench_user)}
+            if kind == 'batch':
+                # The user reviews every title once, so take new ones.
+                first = next(batches) * BATCH_ITEMS
+                return {
+                    'reviews': [
+                        {'title': title, 'text': 'Отзыв', 'score': 5}
+                        for title in ids['titles'][first:first + BATCH_ITEMS]
+                    ],
+                    'comments': [
+                        {'title': ids['title'], 'review': ids['review'],
+                         'text': 'Комментарий'}
+                        for _ in range(BATCH_ITEMS)
+                    ],
+                }
+            return None
+
+        report = {}
+        failures = []
+        for (name, method, url, client_name, data, max_queries,
+                p50_budget, p95_budget) in BUDGETS:
+            client = clients[client_name]
+            url = url.format(**ids)
+            timings = []
+            queries = 0
+            for _ in range(REPEAT):
+                body = payload(data)
+                # Measure the views, not the catalog cache in front of them.
+                bump_catalog_version()
+                with CaptureQueriesContext(connection) as context:
+                    started = time.perf_counter()
+                    response = getattr(client, method)(
+                        url, data=body, format=data and 'json',
+                        REMOTE_ADDR=next(addresses))
+                    if response.streaming:
+                        b''.join(response.streaming_content)
+                    timings.append((time.perf_counter() - started) * 1000)
+                queries = max(queries, len(context.captured_queries))
+                assert response.status_code < 400, (
+                    f'{name}: {method.upper()} {url} вернул статус '
+                    f'{response.status_code}'
+                )
+            result = {
+                'queries': queries,
+                'p50_ms': round(statistics.median(timings), 3),
+                'p95_ms': round(percentile(timings, 95), 3),
+                'budget': {'queries': max_queries, 'p50_ms': p50_budget,
+                           'p95_ms': p95_budget},
+            }
+            report[name] = result
+            if queries > max_queries:
+                failures.append(
+                    f'{name}: {queries} SQL-запросов, бюджет {max_queries}')
+            if result['p50_ms'] > p50_budget:
+                failures.append(
+                    f'{name}: p50 {result["p50_ms"]} мс, бюджет {p50_budget}')
+            if result['p95_ms'] > p95_budget:
+                failures.append(
+                    f'{name}: p95 {result["p95_ms"]} мс, бюджет {p95_budget}')
+
+        if REPORT_PATH:
+            with open(REPORT_PATH, 'w', encoding='utf-8') as report_file:
+                json.dump(report, report_file, indent=2, sort_keys=True)
+        assert not failures, (
+            'Превышен бюджет производительности:\n' + '\n'.join(failures)
+        )
@@ -0,0 +1,135 @@
+import time
+
+import pytest
+from django.core import mail
+from django.core.mail.backends import locmem
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+
+
+class Test12EmailOutbox:
+    url_signup = '/api/v1/auth/signup/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_queues_email(self, client, settings):
+        from users.models import OutgoingEmail
+        settings.EMAIL_OUTBOX_DELIVERY = 'worker'
+        outbox_before_count = len(mail.outbox)
+        data = {'email': 'queued@yamdb.fake', 'username': 'queued'}
+        response = client.post(self.url_signup, data=data)
+        assert response.status_code == 200
+        assert len(mail.outbox) == outbox_before_count, (
+            'Проверьте, что в режиме `worker` письмо не отправляется '
+            'во время запроса'
+        )
+        email = OutgoingEmail.objects.get(recipient=data['email'])
+        assert email.status == 'pending', (
+            'Проверьте, что письмо с кодом подтверждения попадает в очередь'
+        )
+
+        call_command('send_emails')
+        email.refresh_from_db()
+        assert email.status == 'sent' and email.sent_at is not None, (
+            'Проверьте, что команда `send_emails` отправляет письма из очереди'
+        )
+        assert len(mail.outbox) == outbox_before_count + 1
+        assert data['email'] in mail.outbox[-1].to
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_failed_email_retried(self, settings):
+        from users.models import OutgoingEmail
+        from users.outbox import send_pending
+        settings.EMAIL_BACKEND = 'tests.test_12_outbox.BrokenBackend'
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        settings.EMAIL_OUTBOX_RETRY_DELAY = 0
+        email = OutgoingEmail.objects.create(
+            subject='Тема', body='Текст', from_email='noreply@yamdb.local',
+            recipient='broken@yamdb.fake',
+        )
+        assert send_pending() == 0
+        email.refresh_from_db()
+        assert email.status == 'failed' and email.attempts == 2, (
+            'Проверьте, что письмо повторно отправляется и помечается '
+            'ошибочным после исчерпания попыток'
+        )
+        assert email.last_error == 'mail server is down'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_claimed_emails_sent_once(self, settings):
+        from users.models import OutgoingEmail
+        from users.outbox import _claim, send_pending
+        for number in range(3):
+            OutgoingEmail.objects.create(
+                subject='Тема', body='Текст', from_email='noreply@yamdb.local',
+                recipient=f'claimed{number}@yamdb.fake',
+            )
+        outbox_before_count = len(mail.outbox)
+        claimed = _claim(batch_size=2)
+        assert [email.status for email in claimed] == ['sending'] * 2
+        assert send_pending() == 1, (
+            'Проверьте, что письма, взятые в отправку другим процессом, '
+            'не отправляются повторно'
+        )
+        assert len(mail.outbox) == outbox_before_count + 1
+        assert OutgoingEmail.objects.filter(status='sending').count() == 2
+        OutgoingEmail.objects.filter(status='sending').update(
+            send_after='2000-01-01T00:00:00Z')
+        assert send_pending() == 2, (
+            'Проверьте, что письма процесса, не завершившего отправку, '
+            'отправляются после истечения EMAIL_OUTBOX_CLAIM_TIMEOUT'
+        )
+
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_thread_retries_failed_email(self, settings):
+        from users.outbox import queue_email
+        settings.EMAIL_OUTBOX_DELIVERY = 'thread'
+        settings.EMAIL_BACKEND = 'tests.test_12_outbox.FlakyBackend'
+        settings.EMAIL_OUTBOX_RETRY_DELAY = 0.2
+        FlakyBackend.failures = 1
+        outbox_before_count = len(mail.outbox)
+        queue_email('Тема', 'Текст', 'flaky@yamdb.fake')
+        deadline = time.monotonic() + 10
+        while (len(mail.outbox) == outbox_before_count
+               and time.monotonic() < deadline):
+            time.sleep(0.05)
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что в режиме `thread` неотправленное письмо '
+            'отправляется повторно без новых писем в очереди'
+        )
+
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_thread_sends_left_emails(self, client, settings):
+        from users.models import OutgoingEmail
+        settings.EMAIL_OUTBOX_DELIVERY = 'thread'
+        OutgoingEmail.objects.create(
+            subject='Тема', body='Текст', from_email='noreply@yamdb.local',
+            recipient='left@yamdb.fake',
+        )
+        outbox_before_count = len(mail.outbox)
+        client.get('/api/v1/titles/')
+        deadline = time.monotonic() + 10
+        while (len(mail.outbox) == outbox_before_count
+               and time.monotonic() < deadline):
+            time.sleep(0.05)
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что письма, оставшиеся в очереди от прошлых '
+            'процессов, отправляются после запуска'
+        )
+
+
+class BrokenBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise ConnectionError('mail server is down')
+
+
+class FlakyBackend(locmem.EmailBackend):
+    failures = 0
+
+    def send_messages(self, email_messages):
+        if FlakyBackend.failures:
+            FlakyBackend.failures -= 1
+            raise ConnectionError('mail server is down')
+        return super().send_messages(email_messages)
@@ -0,0 +1,47 @@
+import pytest
+
+
+class Test13ConfirmationCode:
+    url_token = '/api/v1/auth/token/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_code_accepted_once(self, client, user, django_assert_num_queries):
+        from users.confirmation import make_confirmation_code
+        code = make_confirmation_code(user)
+        data = {'username': user.username, 'confirmation_code': code}
+        with django_assert_num_queries(1):
+            response = client.post(self.url_token, data=data)
+        assert response.status_code == 200 and 'token' in response.json(), (
+            f'Проверьте, что POST запрос `{self.url_token}` с верным кодом '
+            'подтверждения возвращает токен'
+        )
+        response = client.post(self.url_token, data=data)
+        assert response.status_code == 400, (
+            'Проверьте, что код подтверждения нельзя использовать повторно'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_code_bound_to_username(self, client, user, admin):
+        from users.confirmation import make_confirmation_code
+        data = {
+            'username': admin.username,
+            'confirmation_code': make_confirmation_code(user),
+        }
+        response = client.post(self.url_token, data=data)
+        assert response.status_code == 400, (
+            'Проверьте, что код подтверждения действует только для '
+            'пользователя, которому он выдан'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_code_expires(self, client, user, settings):
+        from users.confirmation import make_confirmation_code
+        settings.CONFIRMATION_CODE_MAX_AGE = -1
+        data = {
+            'username': user.username,
+            'confirmation_code': make_confirmation_code(user),
+        }
+        response = client.post(self.url_token, data=data)
+        assert response.status_code == 400, (
+            'Проверьте, что просроченный код подтверждения не принимается'
+        )
@@ -0,0 +1,68 @@
+import pytest
+
+
+def create_feed(reviews_count):
+    from django.contrib.auth import get_user_model
+    from reviews.models import Review, Title
+    User = get_user_model()
+    User.objects.bulk_create(
+        User(username=f'reader{i}', email=f'reader{i}@yamdb.fake')
+        for i in range(reviews_count)
+    )
+    title = Title.objects.create(name='Произведение', year=2000,
+                                 description='')
+    Review.objects.bulk_create(
+        Review(title=title, author=author, text='Отзыв', score=5)
+        for author in User.objects.all()
+    )
+    return title
+
+
+class Test14CursorPagination:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_review_cursor_pages(self, client, django_assert_num_queries):
+        title = create_feed(25)
+        url = f'/api/v1/titles/{title.id}/reviews/?pagination=cursor'
+        ids = []
+        while url:
+            # title lookup and the page itself, no COUNT(*)
+            with django_assert_num_queries(2):
+                response = client.get(url)
+            assert response.status_code == 200
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что курсорная пагинация не считает число отзывов'
+            )
+            ids.extend(review['id'] for review in data['results'])
+            url = data['next']
+        assert ids == sorted(ids) and len(ids) == 25, (
+            'Проверьте, что курсорная пагинация возвращает все отзывы '
+            'по порядку'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_page_number_by_default(self, client):
+        title = create_feed(3)
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert response.json()['count'] == 3, (
+            'Проверьте, что по умолчанию используется постраничная пагинация'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_search_keeps_rank(self, client):
+        from reviews.models import Review
+        title = create_feed(3)
+        reviews = list(Review.objects.order_by('id'))
+        for review, text in zip(reviews, ('Кот', 'Кот и кот', 'Собака')):
+            review.text = text
+            review.save()
+        url = f'/api/v1/titles/{title.id}/reviews/?search=кот'
+        expected = client.get(url).json()['results']
+        response = client.get(url + '&pagination=cursor')
+        assert response.status_code == 200
+        data = response.json()
+        assert data['results'] == expected and data['count'] == 2, (
+            'Проверьте, что поиск по отзывам с `pagination=cursor` '
+            'сохраняет сортировку по релевантности'
+        )
@@ -0,0 +1,58 @@
+import pytest
+
+from .common import create_comments, create_titles
+
+
+class Test15FullTextSearch:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_search(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get('/api/v1/titles/?search=пово')
+        assert response.status_code == 200
+        names = [title['name'] for title in response.json()['results']]
+        assert names == ['Поворот туда'], (
+            'Проверьте, что параметр `search` ищет произведения по началу '
+            'слов в названии'
+        )
+        response = client.get('/api/v1/titles/?search=драма года')
+        names = [title['name'] for title in response.json()['results']]
+        assert names == ['Проект'], (
+            'Проверьте, что параметр `search` ищет произведения по описанию'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_search_follows_writes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(f'/api/v1/titles/{titles[1]["id"]}/',
+                           data={'name': 'Поворот обратно'})
+        response = client.get('/api/v1/titles/?search=поворот')
+        assert response.json()['count'] == 2, (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения'
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        response = client.get('/api/v1/titles/?search=поворот')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что поисковый индекс обновляется при удалении '
+            'произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_review_and_comment_search(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        title_id = titles[0]['id']
+        response = client.get(
+            f'/api/v1/titles/{title_id}/reviews/?search=qwerty123')
+        texts = [review['text'] for review in response.json()['results']]
+        assert texts == ['qwerty123'], (
+            'Проверьте, что параметр `search` ищет отзывы по тексту'
+        )
+        response = client.get(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[0]["id"]}'
+            '/comments/?search=qwerty321'
+        )
+        texts = [comment['text'] for comment in response.json()['results']]
+        assert texts == ['qwerty321'], (
+            'Проверьте, что параметр `search` ищет комментарии по тексту'
+        )
@@ -0,0 +1,68 @@
+import pytest
+from django.core.management import call_command
+
+from .common import create_titles
+
+
+class Test16CatalogCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_cached_list(self, client, admin_client,
+                            django_assert_num_queries):
+        create_titles(admin_client)
+        response = client.get('/api/v1/titles/?year=2000')
+        assert response.status_code == 200
+        with django_assert_num_queries(0):
+            cached = client.get('/api/v1/titles/?year=2000')
+        assert cached.json() == response.json(), (
+            'Проверьте, что повторный GET запрос `/api/v1/titles/` '
+            'возвращается из кэша'
+        )
+        assert cached['ETag'] == response['ETag']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_etag_not_modified(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        etag = client.get(url)['ETag']
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            'Проверьте, что при совпадении If-None-Match возвращается 304'
+        )
+        admin_client.post(f'{url}reviews/', data={'text': 'Ок', 'score': 7})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200 and response['ETag'] != etag, (
+            'Проверьте, что новый отзыв сбрасывает кэш произведения'
+        )
+        assert response.json()['rating'] == 7
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_writes_invalidate(self, client, admin_client):
+        create_titles(admin_client)
+        assert client.get('/api/v1/genres/').json()['count'] == 3
+        admin_client.post('/api/v1/genres/',
+                          data={'name': 'Сказка', 'slug': 'tale'})
+        assert client.get('/api/v1/genres/').json()['count'] == 4, (
+            'Проверьте, что создание жанра сбрасывает кэш списка жанров'
+        )
+        admin_client.delete('/api/v1/genres/tale/')
+        assert client.get('/api/v1/genres/').json()['count'] == 3, (
+            'Проверьте, что удаление жанра сбрасывает кэш списка жанров'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_rebuild_invalidates(self, client, admin_client, admin):
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert client.get(url).json()['rating'] is None
+        Review.objects.bulk_create([
+            Review(title_id=titles[0]['id'], author=admin,
+                   text='Ок', score=9),
+        ])
+        call_command('rebuild_ratings')
+        assert client.get(url).json()['rating'] == 9, (
+            'Проверьте, что пересчёт рейтингов командой `rebuild_ratings` '
+            'сбрасывает кэш каталога'
+        )
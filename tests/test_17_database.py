@@ -0,0 +1,38 @@
+import pytest
+from django.db import connection
+from django.test import RequestFactory
+
+
+class Test17Database:
+
+    @pytest.mark.django_db
+    def test_01_sqlite_pragmas(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            synchronous = cursor.fetchone()[0]
+            cursor.execute('PRAGMA busy_timeout')
+            busy_timeout = cursor.fetchone()[0]
+        assert synchronous == 1 and busy_timeout == 20000, (
+            'Проверьте, что SQLITE_PRAGMAS применяются к новым соединениям'
+        )
+
+    def test_02_replica_routing(self, settings):
+        from api_yamdb.db import ReplicaRouter, ReplicaRoutingMiddleware
+        settings.DATABASES = {**settings.DATABASES, 'replica_1': {}}
+        router = ReplicaRouter()
+        used = {}
+
+        def view(request):
+            used[request.method] = (
+                router.db_for_read(None), router.db_for_write(None))
+
+        middleware = ReplicaRoutingMiddleware(view)
+        middleware(RequestFactory().get('/api/v1/titles/'))
+        middleware(RequestFactory().post('/api/v1/titles/'))
+        assert used['GET'] == ('replica_1', 'default'), (
+            'Проверьте, что чтение в GET запросах идёт в реплику'
+        )
+        assert used['POST'] == ('default', 'default'), (
+            'Проверьте, что в POST запросах используется основная база'
+        )
+        assert router.db_for_read(None) == 'default'
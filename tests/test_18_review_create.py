@@ -0,0 +1,48 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_titles
+
+
+class Test18ReviewCreate:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_create_queries(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'Ок', 'score': 7})
+        assert response.status_code == 201
+        sql = [query['sql'] for query in context.captured_queries]
+        assert not any(
+            'FROM "reviews_review"' in query and query.startswith('SELECT')
+            for query in sql
+        ), (
+            'Проверьте, что при создании отзыва не выполняется отдельная '
+            'проверка существования отзыва'
+        )
+        assert sum(
+            'FROM "reviews_title"' in query and query.startswith('SELECT')
+            for query in sql
+        ) == 1, (
+            'Проверьте, что при создании отзыва произведение '
+            'загружается один раз'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_duplicate_rejected(self, admin_client, user_client):
+        from reviews.models import Title
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        user_client.post(url, data={'text': 'Ок', 'score': 7})
+        response = user_client.post(url, data={'text': 'Ещё', 'score': 1})
+        assert response.status_code == 400, (
+            'Проверьте, что второй отзыв на произведение отклоняется '
+            'со статусом 400'
+        )
+        assert 'non_field_errors' in response.json()
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_count, title.rating) == (1, 7), (
+            'Проверьте, что отклонённый отзыв не меняет рейтинг'
+        )
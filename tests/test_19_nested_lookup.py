@@ -0,0 +1,54 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_reviews
+
+
+def parent_selects(context, table):
+    return sum(
+        query['sql'].startswith('SELECT')
+        and f'FROM "{table}"' in query['sql']
+        for query in context.captured_queries
+    )
+
+
+class Test19NestedLookup:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_review_update_single_title_lookup(self, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.patch(url, data={'score': 9})
+        assert response.status_code == 200
+        assert parent_selects(context, 'reviews_title') == 1, (
+            'Проверьте, что при изменении отзыва произведение '
+            'загружается один раз'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_comment_create_single_review_lookup(self, admin_client,
+                                                    admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = (f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+               f'{reviews[0]["id"]}/comments/')
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(url, data={'text': 'Согласен'})
+        assert response.status_code == 201
+        assert parent_selects(context, 'reviews_review') == 1, (
+            'Проверьте, что при создании комментария отзыв '
+            'загружается один раз'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_wrong_title_for_review(self, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        response = admin_client.get(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        assert response.status_code == 404, (
+            'Проверьте, что комментарии доступны только для отзыва '
+            'своего произведения'
+        )
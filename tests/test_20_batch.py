@@ -0,0 +1,127 @@
+import pytest
+
+from .common import create_reviews, create_titles
+
+
+class Test20BatchCreate:
+    url = '/api/v1/batch/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_batch_not_auth(self, client):
+        response = client.post(self.url, data={'reviews': []}, format='json')
+        assert response.status_code == 401
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_batch_reviews(self, admin_client, user_client):
+        from reviews.models import Review, Title
+        titles, _, _ = create_titles(admin_client)
+        data = {'reviews': [
+            {'title': titles[0]['id'], 'text': 'Отлично', 'score': 9},
+            {'title': titles[1]['id'], 'text': 'Плохо', 'score': 2},
+            {'title': titles[0]['id'], 'text': 'Повтор', 'score': 5},
+            {'title': titles[1]['id'], 'text': 'Мимо', 'score': 11},
+            {'title': 999999, 'text': 'Нет', 'score': 5},
+        ]}
+        response = user_client.post(self.url, data=data, format='json')
+        assert response.status_code == 200
+        results = response.json()['reviews']
+        assert [result['status'] for result in results] == [
+            201, 201, 400, 400, 404], (
+            'Проверьте, что пакетное создание отзывов возвращает результат '
+            'для каждого отзыва'
+        )
+        review = Review.objects.get(pk=results[0]['id'])
+        assert review.text == 'Отлично' and review.title_id == titles[0]['id']
+        assert Review.objects.get(pk=results[1]['id']).text == 'Плохо'
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_count, title.rating) == (1, 9), (
+            'Проверьте, что пакетное создание отзывов обновляет рейтинг'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_batch_comments(self, admin_client, admin, user_client):
+        from reviews.models import Comments
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        data = {'comments': [
+            {'title': titles[0]['id'], 'review': reviews[0]['id'],
+             'text': 'Первый'},
+            {'title': titles[0]['id'], 'review': reviews[1]['id'],
+             'text': 'Второй'},
+            {'title': titles[1]['id'], 'review': reviews[0]['id'],
+             'text': 'Чужой'},
+            {'title': titles[0]['id'], 'review': reviews[0]['id']},
+        ]}
+        response = user_client.post(self.url, data=data, format='json')
+        results = response.json()['comments']
+        assert [result['status'] for result in results] == [
+            201, 201, 404, 400], (
+            'Проверьте, что пакетное создание комментариев возвращает '
+            'результат для каждого комментария'
+        )
+        assert Comments.objects.get(pk=results[1]['id']).text == 'Второй'
+        assert Comments.objects.get(
+            pk=results[0]['id']).review_id == reviews[0]['id']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_ids_with_concurrent_insert(self, admin_client, admin, user,
+                                           user_client, monkeypatch):
+        from django.db import connection
+        from django.db.models.query import QuerySet
+        from django.test.utils import CaptureQueriesContext
+        from reviews.models import Comments, Review, Title
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        other = Title.objects.create(name='Другое', year=2001,
+                                     description='')
+        bulk_create = QuerySet.bulk_create
+
+        def concurrent_insert_then_bulk_create(queryset, objs, **kwargs):
+            if queryset.model is Review:
+                Review.objects.create(title=other, author=user, text='Чужой',
+                                      score=1)
+            else:
+                Comments.objects.create(review_id=reviews[0]['id'],
+                                        author=user, text='Чужой')
+            return bulk_create(queryset, objs, **kwargs)
+
+        monkeypatch.setattr(QuerySet, 'bulk_create',
+                            concurrent_insert_then_bulk_create)
+        Review.objects.filter(author=user).delete()
+        data = {
+            'reviews': [
+                {'title': titles[1]['id'], 'text': 'Второй', 'score': 2},
+                {'title': titles[0]['id'], 'text': 'Первый', 'score': 9},
+            ],
+            'comments': [
+                {'title': titles[0]['id'], 'review': reviews[0]['id'],
+                 'text': f'Комментарий {number}'}
+                for number in range(3)
+            ],
+        }
+        with CaptureQueriesContext(connection) as context:
+            results = user_client.post(self.url, data=data,
+                                       format='json').json()
+        assert [Review.objects.get(pk=result['id']).text
+                for result in results['reviews']] == ['Второй', 'Первый'], (
+            'Проверьте, что пакетное создание возвращает идентификаторы '
+            'созданных отзывов, даже если автор одновременно пишет другие'
+        )
+        assert [Comments.objects.get(pk=result['id']).text
+                for result in results['comments']] == [
+            f'Комментарий {number}' for number in range(3)]
+        inserts = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('INSERT INTO "reviews_comments"')
+        ]
+        # The concurrent comment and the comments of the batch.
+        assert len(inserts) == 2, (
+            'Проверьте, что комментарии пакета вставляются одним запросом'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_batch_not_object(self, user_client):
+        response = user_client.post(self.url, data=[{'text': 'Отзыв'}],
+                                    format='json')
+        assert response.status_code == 400, (
+            'Проверьте, что пакетный запрос не из объекта возвращает '
+            'статус 400'
+        )
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from .common import create_comments
+
+
+def read_ndjson(response):
+    content = b''.join(response.streaming_content).decode()
+    return [json.loads(line) for line in content.splitlines()]
+
+
+class Test21Export:
+    url = '/api/v1/export/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_export_admin_only(self, client, user_client):
+        assert client.get(self.url).status_code == 401
+        assert user_client.get(self.url).status_code == 403, (
+            f'Проверьте, что `{self.url}` доступен только администратору'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_export_ndjson(self, admin_client, admin):
+        create_comments(admin_client, admin)
+        response = admin_client.get(self.url)
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/x-ndjson'
+        records = read_ndjson(response)
+        types = [record['type'] for record in records]
+        assert types == ['title'] * 2 + ['review'] * 3 + ['comment'] * 3, (
+            'Проверьте, что выгрузка содержит произведения, отзывы '
+            'и комментарии'
+        )
+        title = records[0]
+        assert title['name'] == 'Поворот туда'
+        assert title['genre'] == ['horror', 'comedy']
+        assert title['category'] == 'films' and title['rating'] == 4
+        assert records[1]['genre'] == ['drama']
+        assert records[2]['author'] == admin.username
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_export_updated_since(self, admin_client, admin):
+        from reviews.models import Review
+        _, reviews, _, _, _ = create_comments(admin_client, admin)
+        since = timezone.now()
+        Review.objects.get(pk=reviews[1]['id']).save()
+        response = admin_client.get(
+            self.url, {'updated_since': since.isoformat()})
+        records = read_ndjson(response)
+        assert [(r['type'], r['id']) for r in records] == [
+            ('review', reviews[1]['id'])], (
+            'Проверьте, что `updated_since` оставляет только изменённые '
+            'записи'
+        )
+        response = admin_client.get(self.url, {'updated_since': 'вчера'})
+        assert response.status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_export_command(self, admin_client, admin, tmp_path):
+        create_comments(admin_client, admin)
+        output = tmp_path / 'export.json'
+        call_command('export_data', output=str(output), format='json')
+        records = json.loads(output.read_text(encoding='utf-8'))
+        assert len(records) == 8, (
+            'Проверьте, что команда `export_data` выгружает все записи'
+        )
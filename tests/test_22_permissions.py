@@ -0,0 +1,73 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+PERMISSION_BUDGET_US = 20
+
+
+def make_request(method, user):
+    return SimpleNamespace(method=method, user=user)
+
+
+def check_cost(permission, request, objs):
+    start = time.perf_counter()
+    for obj in objs:
+        permission.has_object_permission(request, None, obj)
+    return (time.perf_counter() - start) / len(objs) * 1e6
+
+
+class Test22Permissions:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_capabilities_computed_once(self, moderator, monkeypatch):
+        from api.permissions import AnonymModeratorAdminAuthor
+        from reviews.models import Review
+
+        calls = []
+        is_admin = type(moderator).is_admin
+        monkeypatch.setattr(
+            type(moderator), 'is_admin',
+            lambda self: calls.append(self) or is_admin(self)
+        )
+        permission = AnonymModeratorAdminAuthor()
+        request = make_request('PATCH', moderator)
+        for author_id in range(100):
+            assert permission.has_object_permission(
+                request, None, Review(author_id=author_id))
+        assert len(calls) == 1, (
+            'Проверьте, что роль пользователя вычисляется один раз '
+            'за запрос, а не для каждого объекта'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_ownership_without_author_query(self, user,
+                                               django_assert_num_queries):
+        from api.permissions import AnonymModeratorAdminAuthor
+        from reviews.models import Comments, Review
+
+        permission = AnonymModeratorAdminAuthor()
+        request = make_request('DELETE', user)
+        with django_assert_num_queries(0):
+            assert permission.has_object_permission(
+                request, None, Review(author_id=user.id))
+            assert not permission.has_object_permission(
+                request, None, Comments(author_id=user.id + 1))
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_permission_cost(self, user, moderator):
+        from api.permissions import AnonymModeratorAdminAuthor
+        from reviews.models import Comments, Review
+
+        permission = AnonymModeratorAdminAuthor()
+        report = {}
+        for name, model in (('reviews', Review), ('comments', Comments)):
+            objs = [model(author_id=author_id) for author_id in range(2000)]
+            for role, person in (('user', user), ('moderator', moderator)):
+                report[f'{name}/{role}'] = check_cost(
+                    permission, make_request('PATCH', person), objs)
+        for key, cost in report.items():
+            assert cost < PERMISSION_BUDGET_US, (
+                f'Проверьте, что проверка прав `{key}` занимает меньше '
+                f'{PERMISSION_BUDGET_US} мкс, сейчас {cost:.2f} мкс'
+            )
@@ -0,0 +1,80 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, bearer_client
+
+
+def user_selects(context):
+    return sum(
+        query['sql'].startswith('SELECT')
+        and 'FROM "users_customuser"' in query['sql']
+        for query in context.captured_queries
+    )
+
+
+def issued_token(client, user):
+    from users.confirmation import make_confirmation_code
+    response = client.post('/api/v1/auth/token/', data={
+        'username': user.username,
+        'confirmation_code': make_confirmation_code(user),
+    })
+    assert response.status_code == 200
+    return response.json()['token']
+
+
+class Test23TokenAuth:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_token_has_role_claims(self, client, moderator):
+        from rest_framework_simplejwt.tokens import AccessToken
+        token = AccessToken(issued_token(client, moderator))
+        assert token['role'] == 'moderator', (
+            'Проверьте, что токен содержит роль пользователя'
+        )
+        assert token['is_staff'] is False and token['is_superuser'] is False
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_safe_request_skips_user_table(self, client, admin):
+        admin_client = bearer_client(issued_token(client, admin))
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        assert user_selects(context) == 0, (
+            'Проверьте, что GET запрос с токеном не загружает '
+            'пользователя из базы данных'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_token_without_claims_uses_database(self, user):
+        with CaptureQueriesContext(connection) as context:
+            response = auth_client(user).get('/api/v1/titles/')
+        assert response.status_code == 200
+        assert user_selects(context) == 1, (
+            'Проверьте, что токен без ролей проверяется по базе данных'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_write_user_cached_until_changed(self, client, user):
+        user_client = bearer_client(issued_token(client, user))
+        url = '/api/v1/categories/'
+        data = {'name': 'Фильм', 'slug': 'films'}
+        user_client.post(url, data=data)
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data=data)
+        assert response.status_code == 403
+        assert user_selects(context) == 0, (
+            'Проверьте, что пользователь для запросов на запись берётся '
+            'из кеша'
+        )
+        user.role = 'admin'
+        user.save()
+        assert user_client.post(url, data=data).status_code == 401, (
+            'Проверьте, что смена роли вне API отзывает токены пользователя'
+        )
+        from api.authentication import RoleAccessToken
+        user_client = bearer_client(str(RoleAccessToken.for_user(user)))
+        response = user_client.post(url, data=data)
+        assert response.status_code == 201, (
+            'Проверьте, что изменение пользователя сбрасывает кеш'
+        )
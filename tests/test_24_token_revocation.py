@@ -0,0 +1,98 @@
+import pytest
+
+from .common import token_client
+
+
+class Test24TokenRevocation:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_role_change_revokes_token(self, django_user_model,
+                                          moderator):
+        superuser = django_user_model.objects.create_superuser(
+            username='RoleAdmin', email='roleadmin@yamdb.fake',
+            password='1234567', role='admin')
+        moderator_client = token_client(moderator)
+        assert moderator_client.get('/api/v1/titles/').status_code == 200
+        response = token_client(superuser).patch(
+            f'/api/v1/users/{moderator.username}/', data={'role': 'user'})
+        assert response.status_code == 200
+        response = moderator_client.get('/api/v1/titles/')
+        assert response.status_code == 401, (
+            'Проверьте, что после смены роли старый токен пользователя '
+            'перестаёт действовать'
+        )
+        moderator.refresh_from_db()
+        response = token_client(moderator).get('/api/v1/titles/')
+        assert response.status_code == 200, (
+            'Проверьте, что новый токен после смены роли действует'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_other_changes_keep_token(self, admin_client, user):
+        user_client = token_client(user)
+        admin_client.patch(f'/api/v1/users/{user.username}/',
+                           data={'bio': 'Новая биография'})
+        assert user_client.get('/api/v1/titles/').status_code == 200, (
+            'Проверьте, что токен отзывается только при смене роли'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_delete_revokes_token(self, admin_client, user):
+        user.role = 'admin'
+        user.save()
+        user_client = token_client(user)
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == 204
+        assert user_client.get('/api/v1/users/').status_code == 401, (
+            'Проверьте, что токен удалённого пользователя не действует'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_revocations_synced_from_database(self, moderator,
+                                                 django_assert_num_queries):
+        from users.revocation import revocations, revoke_tokens
+        moderator_client = token_client(moderator)
+        revoke_tokens(moderator)
+        revocations.clear()
+        assert moderator_client.get('/api/v1/titles/').status_code == 200
+        revocations.sync()
+        assert moderator_client.get('/api/v1/titles/').status_code == 401, (
+            'Проверьте, что список отозванных токенов загружается '
+            'из базы данных'
+        )
+        with django_assert_num_queries(0):
+            revocations.is_revoked(moderator.id, 0)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_new_process_syncs_first(self, moderator):
+        from users.revocation import RevocationList, revoke_tokens
+        revoke_tokens(moderator)
+        assert RevocationList().is_revoked(moderator.id, 0), (
+            'Проверьте, что новый процесс загружает список отозванных '
+            'токенов при первой проверке'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_changes_outside_api_revoke(self, admin, user):
+        admin_client = token_client(admin)
+        user_client = token_client(user)
+        assert admin_client.get('/api/v1/users/').status_code == 200
+        admin.role = 'user'
+        admin.save()
+        assert admin_client.get('/api/v1/users/').status_code == 401, (
+            'Проверьте, что смена роли через `save()` отзывает токены'
+        )
+        user.last_login = user.date_joined
+        user.save(update_fields=['last_login'])
+        assert user_client.get('/api/v1/titles/').status_code == 200
+        user.is_active = False
+        user.save()
+        assert user_client.get('/api/v1/titles/').status_code == 401, (
+            'Проверьте, что отключение пользователя отзывает его токены'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_07_orm_delete_revokes(self, moderator):
+        moderator_client = token_client(moderator)
+        moderator.delete()
+        assert moderator_client.get('/api/v1/titles/').status_code == 401
@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+import pytest
+from django.core.management import call_command
+
+from .common import create_titles
+
+
+def call(application, method, path, body=b'', headers=()):
+    from api.management.commands.load_test import request_scope
+    scope = {**request_scope(path), 'method': method}
+    scope['headers'] = scope['headers'] + list(headers)
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(application(scope, receive, send))
+    start, *chunks = messages
+    return start['status'], b''.join(chunk['body'] for chunk in chunks)
+
+
+class Test25ASGI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_list_served(self, admin_client):
+        from api_yamdb.asgi import application
+        titles, _, _ = create_titles(admin_client)
+        status, body = call(application, 'GET', '/api/v1/titles/')
+        assert status == 200, (
+            'Проверьте, что ASGI приложение отдаёт список произведений'
+        )
+        assert json.loads(body)['count'] == len(titles)
+        status, body = call(application, 'GET',
+                            f'/api/v1/titles/{titles[0]["id"]}/')
+        assert status == 200 and json.loads(body)['id'] == titles[0]['id']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_post_with_body(self, admin):
+        from api_yamdb.asgi import application
+        from rest_framework_simplejwt.tokens import RefreshToken
+        token = RefreshToken.for_user(admin).access_token
+        status, body = call(
+            application, 'POST', '/api/v1/categories/',
+            body=json.dumps({'name': 'Фильм', 'slug': 'films'}).encode(),
+            headers=[(b'content-type', b'application/json'),
+                     (b'authorization', f'Bearer {token}'.encode())],
+        )
+        assert status == 201, (
+            'Проверьте, что ASGI приложение передаёт тело запроса и '
+            'заголовки'
+        )
+
+    def test_03_read_paths_use_read_pool(self):
+        from api_yamdb.asgi import application
+        from api.management.commands.load_test import request_scope
+        for path in ('/api/v1/titles/', '/api/v1/titles/1/',
+                     '/api/v1/titles/1/reviews/',
+                     '/api/v1/titles/1/reviews/2/comments/'):
+            assert (application.executor_for(request_scope(path))
+                    is application.read_executor), (
+                f'Проверьте, что `{path}` обслуживается пулом чтения'
+            )
+        scope = {**request_scope('/api/v1/titles/'), 'method': 'POST'}
+        assert application.executor_for(scope) is application.executor
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_connection_limit(self):
+        from django.core.handlers.wsgi import WSGIHandler
+        from api_yamdb.asgi_handler import ThreadPoolASGIHandler
+        application = ThreadPoolASGIHandler(WSGIHandler(), max_connections=1)
+        application.connections = 1
+        status, _ = call(application, 'GET', '/api/v1/titles/')
+        assert status == 503, (
+            'Проверьте, что соединения сверх ASGI_MAX_CONNECTIONS '
+            'отклоняются'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_load_test_command(self, capsys):
+        call_command('load_test', requests=10, workers=2, concurrency=5,
+                     client_delay=0)
+        output = capsys.readouterr().out
+        assert 'wsgi:' in output and 'asgi:' in output
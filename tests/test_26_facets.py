@@ -0,0 +1,94 @@
+import pytest
+from django.core.management import call_command
+
+from .common import create_titles
+
+URL = '/api/v1/titles/facets/'
+
+
+def counts(facets, facet, key='slug'):
+    return {item[key]: item['count'] for item in facets[facet]}
+
+
+class Test26Facets:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_facets_from_counts_table(self, client, admin_client,
+                                         django_assert_num_queries):
+        titles, categories, genres = create_titles(admin_client)
+        with django_assert_num_queries(3):
+            response = client.get(URL)
+        assert response.status_code == 200, (
+            f'Проверьте, что GET запрос `{URL}` возвращает статус 200'
+        )
+        facets = response.json()
+        assert counts(facets, 'genre') == {
+            genres[0]['slug']: 1, genres[1]['slug']: 1, genres[2]['slug']: 1}
+        assert counts(facets, 'category') == {
+            categories[0]['slug']: 1, categories[1]['slug']: 1}
+        assert counts(facets, 'year', 'year') == {2000: 1, 2020: 1}
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_counts_follow_writes(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        admin_client.patch(f'/api/v1/titles/{titles[1]["id"]}/', data={
+            'year': 2000, 'category': categories[0]['slug'],
+            'genre': [genres[0]['slug']],
+        })
+        facets = client.get(URL).json()
+        assert counts(facets, 'year', 'year') == {2000: 2}, (
+            'Проверьте, что счётчики фасетов обновляются при изменении '
+            'произведения'
+        )
+        assert counts(facets, 'category') == {categories[0]['slug']: 2}
+        assert counts(facets, 'genre') == {
+            genres[0]['slug']: 2, genres[1]['slug']: 1}
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        admin_client.delete(f'/api/v1/genres/{genres[0]["slug"]}/')
+        facets = client.get(URL).json()
+        assert counts(facets, 'genre') == {}
+        assert counts(facets, 'year', 'year') == {2000: 1}
+        call_command('rebuild_facets')
+        assert client.get(URL).json() == facets, (
+            'Проверьте, что пересчёт фасетов совпадает с обновляемыми '
+            'счётчиками'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_facets_for_filter(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        facets = client.get(f'{URL}?year=2020').json()
+        assert counts(facets, 'genre') == {genres[2]['slug']: 1}, (
+            'Проверьте, что фасеты считаются для текущих фильтров'
+        )
+        assert counts(facets, 'year', 'year') == {2020: 1}
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_genre_filter_without_duplicates(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        # 'o' is contained in both genres of the first title
+        response = client.get('/api/v1/titles/?genre=o')
+        ids = [title['id'] for title in response.json()['results']]
+        assert ids == [titles[0]['id']], (
+            'Проверьте, что фильтр по жанру не дублирует произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_facets_for_search(self, client, admin_client, monkeypatch):
+        titles, categories, genres = create_titles(admin_client)
+        response = client.get(f'{URL}?search=проект')
+        assert response.status_code == 200, (
+            'Проверьте, что фасеты считаются для поискового запроса'
+        )
+        facets = response.json()
+        assert counts(facets, 'genre') == {genres[2]['slug']: 1}
+        assert counts(facets, 'year', 'year') == {2020: 1}
+        monkeypatch.setattr('reviews.facets.FACET_BATCH', 1)
+        facets = client.get(f'{URL}?search=п&year=2000').json()
+        assert counts(facets, 'genre') == {
+            genres[0]['slug']: 1, genres[1]['slug']: 1}
+        facets = client.get(f'{URL}?search=п').json()
+        assert counts(facets, 'year', 'year') == {2000: 1, 2020: 1}, (
+            'Проверьте, что фасеты длинного списка произведений '
+            'считаются по частям'
+        )
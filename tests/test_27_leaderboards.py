@@ -0,0 +1,83 @@
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from .common import create_titles
+
+
+def ids(response):
+    return [title['id'] for title in response.json()]
+
+
+class Test27Leaderboards:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_top_rated(self, client, admin_client, user_client):
+        titles, categories, genres = create_titles(admin_client)
+        first, second = (f'/api/v1/titles/{title["id"]}/reviews/'
+                         for title in titles)
+        admin_client.post(first, data={'text': 'Так себе', 'score': 4})
+        admin_client.post(second, data={'text': 'Хорошо', 'score': 6})
+        response = client.get('/api/v1/titles/top/')
+        assert response.status_code == 200, (
+            'Проверьте, что GET запрос `/api/v1/titles/top/` возвращает '
+            'статус 200'
+        )
+        assert ids(response) == [titles[1]['id'], titles[0]['id']], (
+            'Проверьте, что произведения отсортированы по рейтингу'
+        )
+        user_client.post(first, data={'text': 'Шедевр', 'score': 10})
+        response = client.get('/api/v1/titles/top/')
+        assert ids(response) == [titles[0]['id'], titles[1]['id']], (
+            'Проверьте, что рейтинг обновляется при новом отзыве'
+        )
+        response = client.get(
+            f'/api/v1/titles/top/?category={categories[1]["slug"]}')
+        assert ids(response) == [titles[1]['id']]
+        response = client.get(f'/api/v1/titles/top/?genre={genres[0]["slug"]}')
+        assert ids(response) == [titles[0]['id']]
+        response = client.get('/api/v1/titles/top/?size=1')
+        assert ids(response) == [titles[0]['id']]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_genre_and_category_changes(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[1]["id"]}/'
+        admin_client.post(f'{url}reviews/', data={'text': 'Ок', 'score': 6})
+        admin_client.patch(url, data={
+            'genre': [genres[0]['slug']], 'category': categories[0]['slug']})
+        response = client.get(f'/api/v1/titles/top/?genre={genres[0]["slug"]}')
+        assert ids(response) == [titles[1]['id']], (
+            'Проверьте, что рейтинг по жанру учитывает смену жанров'
+        )
+        response = client.get(f'/api/v1/titles/top/?genre={genres[2]["slug"]}')
+        assert ids(response) == []
+        response = client.get(
+            f'/api/v1/titles/top/?category={categories[0]["slug"]}')
+        assert ids(response) == [titles[1]['id']]
+        admin_client.delete(url)
+        assert ids(client.get('/api/v1/titles/top/')) == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_trending(self, client, admin_client, user_client):
+        from reviews.models import Review
+        titles, _, _ = create_titles(admin_client)
+        first, second = (f'/api/v1/titles/{title["id"]}/reviews/'
+                         for title in titles)
+        admin_client.post(first, data={'text': 'Старый', 'score': 10})
+        admin_client.post(second, data={'text': 'Новый', 'score': 1})
+        user_client.post(second, data={'text': 'Новый', 'score': 2})
+        response = client.get('/api/v1/titles/trending/')
+        assert ids(response) == [titles[1]['id'], titles[0]['id']], (
+            'Проверьте, что в трендах первыми идут произведения с '
+            'наибольшим числом новых отзывов'
+        )
+        Review.objects.filter(title_id=titles[1]['id']).update(
+            pub_date='2000-01-01T00:00:00Z')
+        call_command('refresh_rankings')
+        cache.clear()
+        response = client.get('/api/v1/titles/trending/')
+        assert ids(response) == [titles[0]['id']], (
+            'Проверьте, что старые отзывы выпадают из трендов после '
+            '`manage.py refresh_rankings`'
+        )
@@ -0,0 +1,138 @@
+import time
+
+import pytest
+from django.db import connection
+
+from .common import create_titles
+
+TITLES = 1000000
+RECOMPUTE_BUDGET_S = 10
+
+
+class Test28WeightedRating:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_weighted_rating_exposed(self, client, admin_client,
+                                        user_client, settings):
+        settings.RATING_PRIOR_MEAN = 5
+        settings.RATING_MIN_VOTES = 2
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert client.get(url).json()['weighted_rating'] is None
+        admin_client.post(f'{url}reviews/', data={'text': 'Ок', 'score': 10})
+        user_client.post(f'{url}reviews/', data={'text': 'Ок', 'score': 8})
+        data = client.get(url).json()
+        assert data['rating'] == 9
+        assert data['weighted_rating'] == pytest.approx(7), (
+            'Проверьте, что `weighted_rating` равен (сумма оценок + '
+            'RATING_MIN_VOTES * RATING_PRIOR_MEAN) / (число отзывов + '
+            'RATING_MIN_VOTES)'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_recompute_matches_incremental(self, admin_client,
+                                              user_client, settings):
+        from reviews.models import Title
+        from reviews.rating_engine import recompute_weighted_ratings
+        settings.RATING_PRIOR_MEAN = 6
+        titles, _, _ = create_titles(admin_client)
+        for title, score in zip(titles, (3, 9)):
+            url = f'/api/v1/titles/{title["id"]}/reviews/'
+            admin_client.post(url, data={'text': 'Ок', 'score': score})
+            user_client.post(url, data={'text': 'Ок', 'score': score - 1})
+        incremental = dict(Title.objects.values_list('id', 'weighted_rating'))
+        assert recompute_weighted_ratings() == 2
+        recomputed = dict(Title.objects.values_list('id', 'weighted_rating'))
+        assert recomputed == pytest.approx(incremental), (
+            'Проверьте, что пересчёт совпадает с обновлением при записи '
+            'отзывов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_prior_is_catalog_mean(self, settings):
+        from reviews.models import RatingPrior, ScoreHistogram, Title
+        from reviews.rating_engine import recompute_weighted_ratings
+        settings.RATING_PRIOR_MEAN = None
+        settings.RATING_MIN_VOTES = 10
+        one, many, unrated = (
+            Title.objects.create(name=name, year=2000, description='')
+            for name in ('Одна оценка', 'Много оценок', 'Без оценок'))
+        ScoreHistogram.objects.create(title=one, score_10=1)
+        ScoreHistogram.objects.create(title=many, score_9=30)
+        assert recompute_weighted_ratings() == 2
+        assert RatingPrior.objects.get().mean == pytest.approx(
+            (10 + 270) / 31), (
+            'Проверьте, что без RATING_PRIOR_MEAN используется средняя '
+            'оценка каталога'
+        )
+        settings.RATING_PRIOR_MEAN = 5.5
+        recompute_weighted_ratings()
+        weighted = dict(Title.objects.values_list('id', 'weighted_rating'))
+        assert weighted[many.pk] > weighted[one.pk], (
+            'Проверьте, что одна оценка 10 не поднимает произведение выше '
+            'произведения с множеством высоких оценок'
+        )
+        assert weighted[unrated.pk] is None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_recompute_cost(self):
+        from reviews.models import ScoreHistogram, Title
+        from reviews.rating_engine import recompute_weighted_ratings
+        from reviews.search import ensure_search_indexes
+        titles = Title._meta.db_table
+        histograms = ScoreHistogram._meta.db_table
+        with connection.cursor() as cursor:
+            # Seeded in SQL without the full-text triggers, which are
+            # restored below: creating a million titles through the ORM
+            # would take minutes.
+            cursor.execute(f'DROP TRIGGER {titles}_fts_ai')
+            cursor.execute(f'DROP TRIGGER {titles}_fts_ad')
+            cursor.execute(
+                'WITH RECURSIVE numbers(id) AS (SELECT 1 UNION ALL '
+                f'SELECT id + 1 FROM numbers WHERE id < {TITLES}) '
+                f'INSERT INTO {titles} (id, name, description, rating_sum, '
+                "rating_count, updated) SELECT id, 'Произведение', '', 0, 0, "
+                'CURRENT_TIMESTAMP FROM numbers')
+            cursor.execute(
+                f'INSERT INTO {histograms} (title_id, score_1, score_2, '
+                'score_3, score_4, score_5, score_6, score_7, score_8, '
+                'score_9, score_10) SELECT id, 0, 0, 0, 1, 0, 0, 2, 0, '
+                f'id % 5, 0 FROM {titles}')
+        try:
+            started = time.perf_counter()
+            assert recompute_weighted_ratings() == TITLES
+            elapsed = time.perf_counter() - started
+            assert not Title.objects.filter(weighted_rating=None).exists()
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(f'DELETE FROM {histograms}')
+                cursor.execute(f'DELETE FROM {titles}')
+            ensure_search_indexes()
+        assert elapsed < RECOMPUTE_BUDGET_S, (
+            f'Проверьте, что пересчёт {TITLES} произведений занимает '
+            f'меньше {RECOMPUTE_BUDGET_S} с, сейчас {elapsed:.1f} с'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_prior_shared_by_processes(self, admin_client, user_client,
+                                          moderator_client, settings):
+        from django.core.cache import cache
+        from reviews.models import RatingPrior, Title
+        from reviews.rating_engine import recompute_weighted_ratings
+        settings.RATING_PRIOR_MEAN = None
+        settings.RATING_MIN_VOTES = 2
+        titles, _, _ = create_titles(admin_client)
+        urls = [f'/api/v1/titles/{title["id"]}/reviews/' for title in titles]
+        admin_client.post(urls[0], data={'text': 'Ок', 'score': 10})
+        user_client.post(urls[0], data={'text': 'Ок', 'score': 8})
+        admin_client.post(urls[1], data={'text': 'Ок', 'score': 2})
+        recompute_weighted_ratings()
+        prior = RatingPrior.objects.get().mean
+        assert prior == pytest.approx(20 / 3)
+        cache.clear()
+        moderator_client.post(urls[1], data={'text': 'Ок', 'score': 4})
+        title = Title.objects.get(pk=titles[1]['id'])
+        assert title.weighted_rating == pytest.approx((6 + 2 * prior) / 4), (
+            'Проверьте, что обновление рейтинга при записи отзыва '
+            'использует сохранённую в базе среднюю оценку каталога'
+        )
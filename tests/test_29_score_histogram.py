@@ -0,0 +1,98 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_titles
+
+
+def expected(**counts):
+    return {str(score): counts.get(f's{score}', 0) for score in range(1, 11)}
+
+
+class Test29ScoreHistogram:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_histogram_follows_reviews(self, client, admin_client,
+                                          user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert client.get(url).json()['score_histogram'] == expected()
+        review = admin_client.post(
+            f'{url}reviews/', data={'text': 'Ок', 'score': 3}).json()
+        user_client.post(f'{url}reviews/', data={'text': 'Ок', 'score': 9})
+        assert client.get(url).json()['score_histogram'] == expected(
+            s3=1, s9=1), (
+            'Проверьте, что гистограмма оценок обновляется при создании '
+            'отзыва'
+        )
+        admin_client.patch(f'{url}reviews/{review["id"]}/', data={'score': 9})
+        data = client.get(url).json()
+        assert data['score_histogram'] == expected(s9=2), (
+            'Проверьте, что гистограмма оценок обновляется при изменении '
+            'отзыва'
+        )
+        assert data['rating'] == 9
+        admin_client.delete(f'{url}reviews/{review["id"]}/')
+        assert client.get(url).json()['score_histogram'] == expected(s9=1)
+        response = client.get('/api/v1/titles/')
+        assert 'score_histogram' not in response.json()['results'][0]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_detail_without_aggregation(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        admin_client.post(f'{url}reviews/', data={'text': 'Ок', 'score': 5})
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.json()['score_histogram'] == expected(s5=1)
+        assert not any(
+            'GROUP BY' in query['sql'] or 'reviews_review' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что гистограмма оценок не считается при запросе '
+            'произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_rebuild(self, client, admin_client, user_client):
+        from reviews.models import ScoreHistogram, Title
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        admin_client.post(f'{url}reviews/', data={'text': 'Ок', 'score': 2})
+        user_client.post(f'{url}reviews/', data={'text': 'Ок', 'score': 6})
+        ScoreHistogram.objects.all().delete()
+        Title.objects.update(rating=None, rating_sum=0, rating_count=0)
+        call_command('rebuild_ratings')
+        title = Title.objects.select_related('histogram').get(
+            pk=titles[0]['id'])
+        assert title.histogram.counts() == [0, 1, 0, 0, 0, 1, 0, 0, 0, 0], (
+            'Проверьте, что `manage.py rebuild_ratings` пересчитывает '
+            'гистограммы оценок'
+        )
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            8, 2, 4)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_title_follows_histogram(self, admin_client):
+        from reviews.models import ScoreHistogram, Title
+        from reviews.rating import update_title_rating
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        admin_client.post(f'{url}reviews/', data={'text': 'Ок', 'score': 4})
+        Title.objects.update(rating_sum=100, rating_count=7)
+        with CaptureQueriesContext(connection) as context:
+            update_title_rating(titles[0]['id'], added=[8])
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            12, 2, 6), (
+            'Проверьте, что сумма и число оценок произведения берутся '
+            'из гистограммы'
+        )
+        assert sum('UPDATE "reviews_title"' in query['sql']
+                   for query in context.captured_queries) == 1
+        ScoreHistogram.objects.all().delete()
+        update_title_rating(titles[0]['id'], removed=[4])
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            0, 0, None)
@@ -0,0 +1,154 @@
+import multiprocessing
+import os
+import stat
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+TOKEN_URL = '/api/v1/auth/token/'
+
+
+def signup(client, number, address='10.0.0.1'):
+    return client.post(SIGNUP_URL, data={
+        'username': f'throttled{number}',
+        'email': f'throttled{number}@yamdb.fake',
+    }, REMOTE_ADDR=address)
+
+
+def take_tokens(key, count, results):
+    from api.throttling import shared_buckets
+    results.put([shared_buckets.take(key, 3, 0.001, 1000.0)
+                 for _ in range(count)])
+
+
+class Test30AuthThrottle:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_ip_bucket(self, client, settings):
+        settings.AUTH_THROTTLE_RATES = {'signup-ip': '3/min'}
+        for number in range(3):
+            response = signup(client, number)
+            assert response.status_code == 200, (
+                'Проверьте, что запросы в пределах лимита IP-адреса '
+                'к `/api/v1/auth/signup/` выполняются.'
+            )
+        with CaptureQueriesContext(connection) as context:
+            response = signup(client, 3)
+        assert response.status_code == 429, (
+            'Проверьте, что запрос сверх лимита IP-адреса к '
+            '`/api/v1/auth/signup/` возвращает статус 429.'
+        )
+        assert int(response['Retry-After']) > 0, (
+            'Проверьте, что ответ 429 содержит заголовок Retry-After.'
+        )
+        assert not context.captured_queries, (
+            'Проверьте, что отклоненный запрос не обращается к базе данных.'
+        )
+        response = signup(client, 4, address='10.0.0.2')
+        assert response.status_code == 200, (
+            'Проверьте, что лимит одного IP-адреса не действует на другие.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_identity_bucket(self, client, settings):
+        settings.AUTH_THROTTLE_RATES = {'token-identity': '2/min'}
+        statuses = [
+            client.post(TOKEN_URL, data={
+                'username': 'victim', 'confirmation_code': 'guess',
+            }, REMOTE_ADDR=f'10.0.0.{number}').status_code
+            for number in range(3)
+        ]
+        assert statuses == [404, 404, 429], (
+            'Проверьте, что подбор кода к одному имени пользователя '
+            'с разных IP-адресов ограничен.'
+        )
+        response = client.post(TOKEN_URL, data={
+            'username': 'other', 'confirmation_code': 'guess',
+        }, REMOTE_ADDR='10.0.0.9')
+        assert response.status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_global_bucket(self, client, settings):
+        settings.AUTH_THROTTLE_RATES = {'signup': '2/min'}
+        statuses = [signup(client, number, f'10.0.0.{number}').status_code
+                    for number in range(3)]
+        assert statuses == [200, 200, 429], (
+            'Проверьте, что общий лимит `/api/v1/auth/signup/` действует '
+            'на всех клиентов.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_no_token_check(self, settings):
+        settings.AUTH_THROTTLE_RATES = {'token-ip': '1/min'}
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Bearer broken')
+        response = client.post(TOKEN_URL, data={})
+        assert response.status_code == 400, (
+            'Проверьте, что `/api/v1/auth/token/` не проверяет заголовок '
+            'Authorization.'
+        )
+        response = client.post(TOKEN_URL, data={})
+        assert response.status_code == 429
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('storage', ['cache', 'shared'])
+    def test_05_storage(self, client, settings, storage):
+        settings.THROTTLE_STORAGE = storage
+        settings.AUTH_THROTTLE_RATES = {'signup-ip': '1/min'}
+        assert signup(client, 0).status_code == 200
+        assert signup(client, 1).status_code == 429
+
+    def test_06_refill(self):
+        from api.throttling import cache_buckets, shared_buckets
+        for store in (cache_buckets, shared_buckets):
+            assert store.take('refill', 2, 1.0, 100.0) == 0
+            assert store.take('refill', 2, 1.0, 100.0) == 0
+            assert store.take('refill', 2, 1.0, 100.5) == 0.5
+            assert store.take('refill', 2, 1.0, 101.0) == 0, (
+                'Проверьте, что корзина пополняется со временем.'
+            )
+
+    def test_07_shared_between_processes(self):
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        worker = context.Process(target=take_tokens,
+                                 args=('shared', 2, results))
+        worker.start()
+        taken = results.get(timeout=10)
+        worker.join(timeout=10)
+        assert taken == [0, 0]
+        from api.throttling import shared_buckets
+        assert shared_buckets.take('shared', 3, 0.001, 1000.0) == 0
+        assert shared_buckets.take('shared', 3, 0.001, 1000.0) > 0, (
+            'Проверьте, что процессы одного хоста используют общие '
+            'корзины токенов.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_08_forwarded_for_ignored(self, client, settings):
+        settings.AUTH_THROTTLE_RATES = {'signup-ip': '1/min'}
+        statuses = [
+            client.post(SIGNUP_URL, data={
+                'username': f'forwarded{number}',
+                'email': f'forwarded{number}@yamdb.fake',
+            }, HTTP_X_FORWARDED_FOR=f'10.1.0.{number}').status_code
+            for number in range(2)
+        ]
+        assert statuses == [200, 429], (
+            'Проверьте, что без NUM_PROXIES лимит IP-адреса нельзя обойти '
+            'заголовком X-Forwarded-For'
+        )
+
+    def test_09_private_shared_file(self, settings, tmp_path):
+        from api.throttling import shared_buckets
+        path = tmp_path / 'deployment' / 'throttle'
+        settings.THROTTLE_SHARED_PATH = str(path)
+        assert shared_buckets.take('private', 1, 1.0, 0.0) == 0
+        assert stat.S_IMODE(os.stat(path.parent).st_mode) == 0o700
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600, (
+            'Проверьте, что файл общих корзин доступен только владельцу'
+        )
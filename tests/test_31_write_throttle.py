@@ -0,0 +1,145 @@
+import multiprocessing
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from .common import create_titles
+
+WRITE_THROTTLE_BUDGET_US = 50
+
+
+def comments_url(admin_client):
+    titles, _, _ = create_titles(admin_client)
+    reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+    review = admin_client.post(reviews_url, data={'text': 'Отзыв',
+                                                  'score': 7}).json()
+    return f'{reviews_url}{review["id"]}/comments/'
+
+
+def post_comments(client, url, count):
+    return [client.post(url, data={'text': f'Комментарий {number}'})
+            .status_code for number in range(count)]
+
+
+def hit_window(count, results):
+    from api.throttling import windows
+    results.put([windows.hit('shared-window', 3, 60, 1, 30.0)
+                 for _ in range(count)])
+
+
+def check_cost(throttle, request, view, repeat=2000):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        throttle.allow_request(request, view)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+class Test31WriteThrottle:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_user_reviews_limited(self, admin_client, user_client,
+                                     settings):
+        settings.WRITE_THROTTLE_RATES = {'review-write': {'user': '1/min'}}
+        titles, _, _ = create_titles(admin_client)
+        statuses = [
+            user_client.post(f'/api/v1/titles/{title["id"]}/reviews/',
+                             data={'text': 'Отзыв', 'score': 5}).status_code
+            for title in titles
+        ]
+        assert statuses == [201, 429], (
+            'Проверьте, что отзывы пользователя сверх лимита отклоняются '
+            'со статусом 429.'
+        )
+        response = user_client.get(f'/api/v1/titles/{titles[1]["id"]}/reviews/')
+        assert response.status_code == 200, (
+            'Проверьте, что лимит не действует на чтение отзывов.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_comments_by_role(self, admin_client, user_client,
+                                 moderator_client, settings):
+        settings.WRITE_THROTTLE_RATES = {
+            'comment-write': {'user': '2/min', 'moderator': '3/min'},
+        }
+        url = comments_url(admin_client)
+        assert post_comments(user_client, url, 3) == [201, 201, 429], (
+            'Проверьте, что комментарии пользователя ограничены.'
+        )
+        assert post_comments(moderator_client, url, 4) == [
+            201, 201, 201, 429], (
+            'Проверьте, что у модератора свой, больший лимит.'
+        )
+        assert post_comments(admin_client, url, 5) == [201] * 5, (
+            'Проверьте, что администратор не ограничен.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_batch_items_counted(self, admin_client, user_client,
+                                    settings):
+        from reviews.models import Review
+        settings.WRITE_THROTTLE_RATES = {'review-write': {'user': '1/min'}}
+        titles, _, _ = create_titles(admin_client)
+        response = user_client.post('/api/v1/batch/', data={'reviews': [
+            {'title': title['id'], 'text': 'Отзыв', 'score': 5}
+            for title in titles
+        ]}, format='json')
+        assert response.status_code == 429, (
+            'Проверьте, что каждый отзыв пакетного запроса учитывается '
+            'в лимите.'
+        )
+        assert not Review.objects.exists()
+
+    @pytest.mark.parametrize('storage', ['cache', 'shared'])
+    def test_04_sliding_window(self, settings, storage):
+        from api.throttling import windows
+        settings.THROTTLE_STORAGE = storage
+        assert windows.hit('window', 10, 60, 10, 59.0) == 0
+        assert windows.hit('window', 10, 60, 1, 59.0) == pytest.approx(1)
+        assert windows.hit('window', 10, 60, 1, 60.0) == pytest.approx(6), (
+            'Проверьте, что запросы предыдущего окна учитываются '
+            'в скользящем окне.'
+        )
+        assert windows.hit('window', 10, 60, 5, 90.0) == 0, (
+            'Проверьте, что вклад предыдущего окна убывает со временем '
+            'и что отклоненные запросы не учитываются.'
+        )
+        assert windows.hit('window', 10, 60, 1, 90.0) > 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_throttle_cost(self, user, moderator, admin, settings):
+        from api.throttling import WriteThrottle
+        settings.WRITE_THROTTLE_RATES = {
+            'review-write': {'user': '1000000/hour',
+                             'moderator': '1000000/hour'},
+        }
+        throttle = WriteThrottle()
+        view = SimpleNamespace(throttle_scope='review-write')
+        report = {}
+        for role, person in (('user', user), ('moderator', moderator),
+                             ('admin', admin)):
+            for method in ('GET', 'POST'):
+                request = SimpleNamespace(method=method, user=person)
+                report[f'{method} {role}'] = check_cost(
+                    throttle, request, view)
+        for key, cost in report.items():
+            assert cost < WRITE_THROTTLE_BUDGET_US, (
+                f'Проверьте, что проверка лимита `{key}` занимает меньше '
+                f'{WRITE_THROTTLE_BUDGET_US} мкс, сейчас {cost:.2f} мкс'
+            )
+
+    def test_06_shared_between_processes(self, settings):
+        settings.THROTTLE_STORAGE = 'shared'
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        worker = context.Process(target=hit_window, args=(2, results))
+        worker.start()
+        hits = results.get(timeout=10)
+        worker.join(timeout=10)
+        assert hits == [0, 0]
+        from api.throttling import windows
+        assert windows.hit('shared-window', 3, 60, 1, 30.0) == 0
+        assert windows.hit('shared-window', 3, 60, 1, 30.0) > 0, (
+            'Проверьте, что процессы одного хоста используют общие '
+            'счетчики записей.'
+        )